@@ -0,0 +1,195 @@
+"""Replay exported scans through one or more scorer configurations.
+
+A configuration is an OpportunityScorer subclass (or the class itself) whose
+thresholds you want to compare, e.g.
+
+    class StricterPhases(OpportunityScorer):
+        def classify_phase(self, momentum, supply, gap_score):
+            ...
+
+    report = run_backtest('/data/scans', {'live': OpportunityScorer,
+                                          'strict': StricterPhases})
+
+Rows are streamed from the memory-mapped scan export in batches and scored
+across a process pool. Each configuration gets its phase distribution and the
+Spearman rank correlation between its gap score and the topic's momentum
+`horizon_days` later (the first later scan at or after the horizon).
+"""
+import os
+import sys
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from analytics.scan_export import SUPPLY_COLUMNS, load_scoring_frame
+from scoring.scorer import OpportunityScorer
+
+_configs = None  # name -> scorer instance, per worker process
+
+
+def _init_worker(configs):
+    global _configs
+    _configs = {name: scorer_cls(None) for name, scorer_cls in configs.items()}
+
+
+def _score_batch(batch):
+    """Score one record batch with every configuration; returns (name -> gaps, name -> phase counts)"""
+    columns = batch.to_pydict()
+    n = batch.num_rows
+    gaps = {name: np.empty(n, dtype=np.float64) for name in _configs}
+    phases = {name: Counter() for name in _configs}
+
+    supply_cols = [(col, columns[col]) for col in SUPPLY_COLUMNS if col in columns]
+    reddit = columns['reddit_total_score']
+    hn = columns['hn_total_score']
+    trends = columns['google_trends_value']
+    total_results = columns.get('total_results', [None] * n)
+
+    for i in range(n):
+        signals = {
+            'reddit_total_score': reddit[i],
+            'hn_total_score': hn[i],
+            'google_trends_value': trends[i]
+        }
+        if total_results[i] is None:
+            youtube_data = None
+        else:
+            youtube_data = {col: values[i] or 0 for col, values in supply_cols}
+
+        for name, scorer in _configs.items():
+            momentum = scorer.calculate_momentum_score(signals)
+            supply = scorer.calculate_supply_score(youtube_data)
+            gap = scorer.calculate_gap_score(momentum, supply)
+            phases[name][scorer.classify_phase(momentum, supply, gap)] += 1
+            gaps[name][i] = gap
+
+    return gaps, phases
+
+
+def future_outcomes(frame, horizon_days=7, outcome_column='momentum_score'):
+    """Outcome per row: the topic's value at its first scan >= horizon later (NaN if none)"""
+    topic_codes = frame.column('topic_id').dictionary_encode().combine_chunks().indices
+    codes = topic_codes.to_numpy(zero_copy_only=False).astype(np.int64)
+    times = frame.column('scanned_at').cast('int64').to_numpy(zero_copy_only=False) // 1_000_000
+    values = frame.column(outcome_column).to_numpy(zero_copy_only=False).astype(np.float64)
+
+    base = times.min() if len(times) else 0
+    span = int(times.max() - base) + 1 if len(times) else 1
+    keys = codes * span + (times - base)
+
+    order = np.argsort(keys, kind='stable')
+    sorted_keys = keys[order]
+    sorted_codes = codes[order]
+
+    idx = np.searchsorted(sorted_keys, keys + horizon_days * 86400)
+    found = idx < len(sorted_keys)
+    found[found] &= sorted_codes[idx[found]] == codes[found]
+
+    outcomes = np.full(len(keys), np.nan)
+    outcomes[found] = values[order[idx[found]]]
+    return outcomes
+
+
+def _rank(values):
+    """Average ranks (ties share their mean rank)"""
+    order = np.argsort(values, kind='mergesort')
+    sorted_values = values[order]
+    ranks = np.empty(len(values), dtype=np.float64)
+
+    boundaries = np.flatnonzero(np.diff(sorted_values)) + 1
+    starts = np.concatenate(([0], boundaries))
+    ends = np.concatenate((boundaries, [len(values)]))
+    avg = (starts + ends - 1) / 2 + 1
+    ranks[order] = np.repeat(avg, ends - starts)
+    return ranks
+
+
+def spearman(x, y):
+    """Spearman rank correlation, or None when undefined"""
+    if len(x) < 2:
+        return None
+    rx, ry = _rank(x), _rank(y)
+    if rx.std() == 0 or ry.std() == 0:
+        return None
+    return float(np.corrcoef(rx, ry)[0, 1])
+
+
+def run_backtest(root, configs, start=None, end=None, horizon_days=7,
+                 workers=None, batch_size=50_000, file_format='arrow'):
+    """Replay exported scans through each scorer config and summarise the results"""
+    frame = load_scoring_frame(root, start, end, file_format=file_format)
+    if frame is None or frame.num_rows == 0:
+        return {}
+
+    outcomes = future_outcomes(frame, horizon_days)
+    columns = ['topic_id', 'reddit_total_score', 'hn_total_score', 'google_trends_value']
+    columns += [c for c in SUPPLY_COLUMNS if c in frame.column_names]
+    batches = frame.select(columns).to_batches(max_chunksize=batch_size)
+
+    workers = workers or os.cpu_count() or 1
+    gap_parts = {name: [] for name in configs}
+    phase_totals = {name: Counter() for name in configs}
+
+    def collect(future):
+        gaps, phases = future.result()
+        for name in configs:
+            gap_parts[name].append(gaps[name])
+            phase_totals[name].update(phases[name])
+
+    # Keep a bounded number of batches in flight so memory stays flat no
+    # matter how many rows the date range covers; results come back in order
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(configs,)) as pool:
+        pending = deque()
+        for batch in batches:
+            if len(pending) >= workers * 2:
+                collect(pending.popleft())
+            pending.append(pool.submit(_score_batch, batch))
+        while pending:
+            collect(pending.popleft())
+
+    has_outcome = ~np.isnan(outcomes)
+    report = {}
+    for name in configs:
+        gaps = np.concatenate(gap_parts[name])
+        report[name] = {
+            'rows': int(frame.num_rows),
+            'phases': dict(phase_totals[name]),
+            'rows_with_outcome': int(has_outcome.sum()),
+            'spearman': spearman(gaps[has_outcome], outcomes[has_outcome]),
+        }
+    return report
+
+
+def print_report(report):
+    for name, result in report.items():
+        total = result['rows'] or 1
+        rho = result['spearman']
+        print(f"\n{name}: {result['rows']} rows, "
+              f"spearman vs outcome = {'n/a' if rho is None else f'{rho:.3f}'} "
+              f"({result['rows_with_outcome']} rows with outcome)")
+        for phase in ('innovation', 'emergence', 'growth', 'maturity', 'saturated'):
+            count = result['phases'].get(phase, 0)
+            print(f"  {phase:<11} {count:>9} ({count / total:6.1%})")
+
+
+if __name__ == '__main__':
+    import argparse
+    from config import SCAN_EXPORT_DIR, SCAN_EXPORT_FORMAT
+
+    parser = argparse.ArgumentParser(description='Replay exported scans through the current scorer')
+    parser.add_argument('--root', default=SCAN_EXPORT_DIR)
+    parser.add_argument('--start')
+    parser.add_argument('--end')
+    parser.add_argument('--horizon-days', type=int, default=7)
+    parser.add_argument('--workers', type=int)
+    args = parser.parse_args()
+
+    if not args.root:
+        parser.error('--root or SCAN_EXPORT_DIR is required')
+
+    print_report(run_backtest(args.root, {'current': OpportunityScorer}, args.start, args.end,
+                              args.horizon_days, args.workers, file_format=SCAN_EXPORT_FORMAT))
@@ -0,0 +1,235 @@
+"""Columnar export of scan results for offline analysis.
+
+Each scan writes one file per table under a Hive-style date partition:
+
+    <root>/<table>/date=YYYY-MM-DD/scan-<scan_id>.arrow
+
+Arrow IPC files are written uncompressed so the reader can memory-map them;
+set SCAN_EXPORT_FORMAT=parquet to trade that for smaller files. pyarrow is
+only imported when an export or read actually happens.
+"""
+import os
+
+TABLES = ('topics', 'sources', 'signals', 'supply', 'opportunities')
+FORMATS = {'arrow': ('ipc', '.arrow'), 'parquet': ('parquet', '.parquet')}
+
+SIGNAL_COLUMNS = (
+    'reddit_total_score', 'reddit_total_comments', 'reddit_post_count',
+    'hn_total_score', 'hn_post_count', 'google_trends_value', 'google_trends_is_breakout',
+)
+SUPPLY_COLUMNS = (
+    'total_results', 'results_last_7_days', 'results_last_30_days', 'results_last_90_days',
+    'avg_video_age_days', 'median_video_age_days', 'title_match_ratio',
+    'avg_channel_subscribers', 'median_channel_subscribers',
+    'large_channel_count', 'small_channel_count', 'outlier_count',
+)
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        return pyarrow
+    except ImportError:
+        raise RuntimeError("pyarrow is required for scan export (pip install pyarrow)")
+
+
+def _schemas(pa):
+    """Fixed per-table schemas, so files stay unifiable even when a column is all null"""
+    scan = [('scan_id', pa.string()), ('scanned_at', pa.timestamp('us')), ('topic_id', pa.string())]
+    return {
+        'topics': pa.schema(scan + [
+            ('keyword', pa.string()),
+            ('keyword_normalised', pa.string()),
+            ('category', pa.string()),
+        ]),
+        'sources': pa.schema(scan + [
+            ('source', pa.string()),
+            ('source_url', pa.string()),
+            ('source_title', pa.string()),
+            ('score', pa.int64()),
+            ('num_comments', pa.int64()),
+            ('subreddit', pa.string()),
+            ('seed_keyword', pa.string()),
+            ('trend_value', pa.string()),
+            ('is_breakout', pa.bool_()),
+        ]),
+        'signals': pa.schema(scan + [
+            (col, pa.bool_() if col == 'google_trends_is_breakout' else pa.int64())
+            for col in SIGNAL_COLUMNS
+        ] + [
+            ('momentum_score', pa.float64()),
+            ('source_count', pa.int32()),
+            ('velocity_24h', pa.float64()),
+            ('velocity_7d', pa.float64()),
+            ('momentum_ewma', pa.float64()),
+        ]),
+        'supply': pa.schema(scan + [
+            (col, pa.float64() if col.startswith(('avg_', 'median_', 'title_')) else pa.int64())
+            for col in SUPPLY_COLUMNS
+        ]),
+        'opportunities': pa.schema(scan + [
+            ('external_momentum', pa.float64()),
+            ('youtube_supply', pa.int32()),
+            ('gap_score', pa.float64()),
+            ('phase', pa.string()),
+            ('confidence', pa.string()),
+            ('velocity_trend', pa.string()),
+        ]),
+    }
+
+
+def _scan_columns(scan_id, scanned_at, n):
+    return {'scan_id': [str(scan_id)] * n, 'scanned_at': [scanned_at] * n}
+
+
+def build_tables(scan_id, scanned_at, topics):
+    """Flatten one scan's Topic records into per-table column dicts"""
+    topics = [t for t in topics if t.id is not None]
+
+    topic_cols = _scan_columns(scan_id, scanned_at, len(topics))
+    topic_cols.update({
+        'topic_id': [t.id for t in topics],
+        'keyword': [t.keyword for t in topics],
+        'keyword_normalised': [t.keyword_normalised for t in topics],
+        'category': [t.category for t in topics],
+    })
+
+    source_rows = [(t.id, s) for t in topics for s in t.sources]
+    source_cols = _scan_columns(scan_id, scanned_at, len(source_rows))
+    source_cols.update({
+        'topic_id': [tid for tid, _ in source_rows],
+        'source': [s.source for _, s in source_rows],
+        'source_url': [s.source_url for _, s in source_rows],
+        'source_title': [s.source_title for _, s in source_rows],
+        'score': [getattr(s, 'score', None) for _, s in source_rows],
+        'num_comments': [getattr(s, 'num_comments', None) for _, s in source_rows],
+        'subreddit': [getattr(s, 'subreddit', None) for _, s in source_rows],
+        'seed_keyword': [getattr(s, 'seed_keyword', None) for _, s in source_rows],
+        'trend_value': [getattr(s, 'trend_value', None) for _, s in source_rows],
+        'is_breakout': [getattr(s, 'is_breakout', None) for _, s in source_rows],
+    })
+
+    signalled = [t for t in topics if t.signals is not None]
+    signal_cols = _scan_columns(scan_id, scanned_at, len(signalled))
+    signal_cols['topic_id'] = [t.id for t in signalled]
+    for col in SIGNAL_COLUMNS:
+        signal_cols[col] = [t.signals.get(col) for t in signalled]
+    signal_cols.update({
+        'momentum_score': [float(t.momentum) for t in signalled],
+        'source_count': [t.source_count for t in signalled],
+        'velocity_24h': [t.velocity_24h for t in signalled],
+        'velocity_7d': [t.velocity_7d for t in signalled],
+        'momentum_ewma': [t.momentum_ewma for t in signalled],
+    })
+
+    supplied = [t for t in topics if t.youtube_data]
+    supply_cols = _scan_columns(scan_id, scanned_at, len(supplied))
+    supply_cols['topic_id'] = [t.id for t in supplied]
+    for col in SUPPLY_COLUMNS:
+        supply_cols[col] = [t.youtube_data.get(col) for t in supplied]
+
+    scored = [t for t in topics if t.phase is not None]
+    opportunity_cols = _scan_columns(scan_id, scanned_at, len(scored))
+    opportunity_cols.update({
+        'topic_id': [t.id for t in scored],
+        'external_momentum': [float(t.momentum) for t in scored],
+        'youtube_supply': [t.supply_score for t in scored],
+        'gap_score': [float(t.gap_score) for t in scored],
+        'phase': [t.phase for t in scored],
+        'confidence': [t.confidence for t in scored],
+        'velocity_trend': [t.velocity_trend for t in scored],
+    })
+
+    return {
+        'topics': topic_cols,
+        'sources': source_cols,
+        'signals': signal_cols,
+        'supply': supply_cols,
+        'opportunities': opportunity_cols,
+    }
+
+
+class ScanExporter:
+    """Writes each scan's results as partitioned columnar files"""
+
+    def __init__(self, root, file_format='arrow'):
+        if file_format not in FORMATS:
+            raise ValueError(f"Unknown scan export format '{file_format}'")
+        self.root = root
+        self.file_format = file_format
+
+    def export(self, scan_id, scanned_at, topics):
+        """Write all tables for one scan; returns rows written per table"""
+        pa = _pyarrow()
+        schemas = _schemas(pa)
+        partition = f"date={scanned_at.date().isoformat()}"
+        extension = FORMATS[self.file_format][1]
+
+        written = {}
+        for name, columns in build_tables(scan_id, scanned_at, topics).items():
+            table = pa.table(columns, schema=schemas[name])
+            directory = os.path.join(self.root, name, partition)
+            os.makedirs(directory, exist_ok=True)
+            path = os.path.join(directory, f"scan-{scan_id}{extension}")
+            self._write(table, path)
+            written[name] = table.num_rows
+        return written
+
+    def _write(self, table, path):
+        tmp_path = f"{path}.tmp"
+        if self.file_format == 'parquet':
+            import pyarrow.parquet as pq
+            pq.write_table(table, tmp_path)
+        else:
+            import pyarrow.feather as feather
+            feather.write_feather(table, tmp_path, compression='uncompressed')
+        os.replace(tmp_path, path)
+
+
+def load_table(root, table, start=None, end=None, columns=None, file_format='arrow'):
+    """Load one exported table for an inclusive date range (YYYY-MM-DD strings)"""
+    if table not in TABLES:
+        raise ValueError(f"Unknown scan export table '{table}'")
+    pa = _pyarrow()
+    import pyarrow.dataset as ds
+    from pyarrow.fs import LocalFileSystem
+
+    path = os.path.join(root, table)
+    if not os.path.isdir(path):
+        return None
+
+    dataset = ds.dataset(
+        path,
+        schema=_schemas(pa)[table].append(pa.field('date', pa.string())),
+        format=FORMATS[file_format][0],
+        partitioning=ds.partitioning(pa.schema([('date', pa.string())]), flavor='hive'),
+        filesystem=LocalFileSystem(use_mmap=True),
+        exclude_invalid_files=True,
+    )
+
+    date = ds.field('date')
+    condition = None
+    if start:
+        condition = date >= str(start)
+    if end:
+        condition = date <= str(end) if condition is None else condition & (date <= str(end))
+
+    return dataset.to_table(columns=list(columns) if columns else None, filter=condition)
+
+
+def load_scoring_frame(root, start=None, end=None, file_format='arrow'):
+    """Signals joined with supply metrics per (scan, topic), ready for scoring.
+
+    Topics without a YouTube check in that scan keep null supply columns,
+    matching how the live scan scores them.
+    """
+    signals = load_table(root, 'signals', start, end, file_format=file_format)
+    if signals is None:
+        return None
+
+    supply = load_table(root, 'supply', start, end, file_format=file_format)
+    if supply is None or supply.num_rows == 0:
+        return signals
+
+    supply = supply.drop_columns([c for c in ('scanned_at', 'date') if c in supply.column_names])
+    return signals.join(supply, keys=['scan_id', 'topic_id'], join_type='left outer')
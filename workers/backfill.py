@@ -0,0 +1,108 @@
+"""Backfill topics from Reddit/HN dumps.
+
+Dumps are JSON lines (optionally .gz), one submission or item per line, in the
+field layout of the public APIs the collectors read:
+
+    reddit: title, score, num_comments, created_utc, subreddit, permalink[, upvote_ratio, author]
+    hn:     id, title, score, descendants, time[, url, type]
+
+    python backfill.py --reddit RS_2025-*.jsonl.gz --hn hn_items.jsonl --workers 32
+
+Keyword extraction runs across a process pool (see processing.py); topics and
+their sources are then upserted as in a normal scan. --dry-run stops after
+processing and prints the topic count and throughput.
+"""
+import argparse
+import gzip
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from supabase import create_client
+
+from config import SUPABASE_URL, SUPABASE_KEY
+from collectors.reddit_collector import RedditCollector
+from records import HNStory
+from main import process_collected_data, upsert_topics
+
+
+def _lines(path):
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rt', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def load_reddit_dump(paths, categories=None, min_score=0):
+    """RedditPosts from dump files; categories maps subreddit (lowercase) -> category"""
+    categories = categories or {}
+    posts = []
+    for path in paths:
+        for p in _lines(path):
+            if not p.get('title') or p.get('score', 0) < min_score:
+                continue
+            post = RedditCollector._to_post(p, p['subreddit'])
+            post.category = categories.get(p['subreddit'].lower(), 'uncategorised')
+            posts.append(post)
+    return posts
+
+
+def load_hn_dump(paths, min_score=0):
+    stories = []
+    for path in paths:
+        for item in _lines(path):
+            if item.get('type', 'story') != 'story' or not item.get('title'):
+                continue
+            if (item.get('score') or 0) < min_score:
+                continue
+            hn_url = f"https://news.ycombinator.com/item?id={item['id']}"
+            stories.append(HNStory(
+                title=item['title'],
+                score=item.get('score') or 0,
+                url=item.get('url', hn_url),
+                hn_url=hn_url,
+                num_comments=item.get('descendants') or 0,
+                created_utc=item.get('time', 0)
+            ))
+    return stories
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Backfill topics from Reddit/HN dumps')
+    parser.add_argument('--reddit', nargs='*', default=[], help='Reddit submission dump files')
+    parser.add_argument('--hn', nargs='*', default=[], help='HN item dump files')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='processes for keyword extraction (default: all cores)')
+    parser.add_argument('--min-score', type=int, default=0, help='skip posts scoring below this')
+    parser.add_argument('--dry-run', action='store_true', help='process only; no database access')
+    args = parser.parse_args(argv)
+
+    categories = {}
+    supabase = None
+    if not args.dry_run:
+        supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+        config = supabase.table('subreddit_config').select('subreddit, category').execute()
+        categories = {row['subreddit'].lower(): row['category'] for row in config.data}
+
+    started = time.perf_counter()
+    reddit_posts = load_reddit_dump(args.reddit, categories, args.min_score)
+    hn_stories = load_hn_dump(args.hn, args.min_score)
+    loaded = time.perf_counter()
+    print(f"Loaded {len(reddit_posts)} Reddit posts and {len(hn_stories)} HN stories in {loaded - started:.1f}s")
+
+    topics_map = process_collected_data(supabase, reddit_posts, hn_stories, [], workers=args.workers)
+    processed = time.perf_counter()
+    titles = len(reddit_posts) + len(hn_stories)
+    print(f"Processed {titles} titles in {processed - loaded:.1f}s "
+          f"({titles / max(processed - loaded, 1e-9):.0f} titles/s, {args.workers} workers)")
+
+    if not args.dry_run:
+        upsert_topics(supabase, topics_map)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""Scaling benchmark for the process-pool backfill path.
+
+Splits the work of process_parallel into its parallel part (keyword
+extraction per shard, run in workers) and its serial part (unpacking and
+merging shards in the parent), reports the speedup that split allows, then
+times process_parallel end to end for 1, 2, 4, ... workers up to the core
+count.
+
+    python benchmarks/bench_backfill.py [num_titles]
+"""
+import gc
+import os
+import pickle
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from processing import (
+    _shards, index_titles, merge_packed, pack_partial, process_parallel, process_serial,
+)
+from records import RedditPost
+
+WORDS = (['Rust', 'Python', 'Llama', 'Vector', 'Search', 'Agents', 'Local', 'Cloud',
+          'Kernel', 'Editor', 'Browser', 'Privacy', 'the', 'with', 'for', '"Zed"']
+         + [f"W{chr(97 + i % 26)}{chr(97 + i // 26 % 26)}x" for i in range(600)])
+
+
+def synthetic_posts(n, seed=1):
+    rnd = random.Random(seed)
+    return [RedditPost(' '.join(rnd.choice(WORDS) for _ in range(rnd.randint(3, 9))),
+                       rnd.randint(1, 900), 0.9, 3, 1700000000 + i, f"sub{i % 7}",
+                       f"https://reddit.com/r/sub/comments/{i:x}/", category=f"c{i % 3}")
+            for i in range(n)]
+
+
+def split_cost(posts, shard_size):
+    shards = _shards('reddit', len(posts), shard_size)
+    gc.disable()
+    started = time.perf_counter()
+    blobs = [pickle.dumps(pack_partial(index_titles(posts, start, stop)), pickle.HIGHEST_PROTOCOL)
+             for _, start, stop in shards]
+    extract = time.perf_counter() - started
+
+    started = time.perf_counter()
+    topics_map = {}
+    for blob in blobs:
+        merge_packed(topics_map, pickle.loads(blob), posts)
+    merge = time.perf_counter() - started
+    gc.enable()
+    return extract, merge, len(topics_map)
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 400_000
+    posts = synthetic_posts(n)
+    cores = os.cpu_count() or 1
+
+    extract, merge, topics = split_cost(posts, 12_500)
+    print(f"titles: {n}, topics: {topics}")
+    print(f"  extraction (parallel): {extract:6.2f}s")
+    print(f"  merge (parent, serial): {merge:6.2f}s")
+    print(f"  speedup bound: {(extract + merge) / merge:.1f}x")
+
+    started = time.perf_counter()
+    process_serial(posts, [], [])
+    serial = time.perf_counter() - started
+    print(f"\n{'workers':>8} {'seconds':>9} {'speedup':>8}")
+    print(f"{'serial':>8} {serial:>9.2f} {1:>8.1f}")
+
+    workers = 1
+    while workers <= cores:
+        if workers > 1:
+            started = time.perf_counter()
+            process_parallel(posts, [], [], workers=workers)
+            elapsed = time.perf_counter() - started
+            print(f"{workers:>8} {elapsed:>9.2f} {serial / elapsed:>8.1f}")
+        workers *= 2
+    if cores == 1:
+        print("  (single core: end-to-end scaling not measurable here)")
+
+
+if __name__ == '__main__':
+    main()
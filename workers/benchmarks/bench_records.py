@@ -0,0 +1,95 @@
+"""Memory benchmark: dict-shaped scan data vs slotted records.
+
+Builds N synthetic Reddit posts plus one topic source per post in both the
+legacy dict-of-dicts layout and the records used by the pipeline (where the
+post itself is the source), and reports the traced allocation for each.
+
+    python benchmarks/bench_records.py [num_posts]
+"""
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from records import RedditPost
+
+
+def _raw_posts(n):
+    # Strings are built up front so both layouts share them and only the
+    # container overhead is measured.
+    return [(f"Post title number {i} about Some Topic", f"/r/sub/comments/{i:x}/post/", f"user{i % 5000}")
+            for i in range(n)]
+
+
+def build_dicts(raw):
+    posts, sources = [], []
+    for i, (title, permalink, author) in enumerate(raw):
+        post = {
+            'title': title,
+            'score': 50 + i % 1000,
+            'upvote_ratio': 0.9,
+            'num_comments': i % 300,
+            'created_utc': 1700000000 + i,
+            'subreddit': 'sub',
+            'url': f"https://reddit.com{permalink}",
+            'author': author,
+            'category': 'tech',
+        }
+        posts.append(post)
+        sources.append({
+            'source': 'reddit',
+            'source_url': post['url'],
+            'source_title': post['title'],
+            'source_metadata': {
+                'subreddit': post['subreddit'],
+                'score': post['score'],
+                'num_comments': post['num_comments']
+            }
+        })
+    return posts, sources
+
+
+def build_records(raw):
+    posts, sources = [], []
+    for i, (title, permalink, author) in enumerate(raw):
+        post = RedditPost(
+            title=title,
+            score=50 + i % 1000,
+            upvote_ratio=0.9,
+            num_comments=i % 300,
+            created_utc=1700000000 + i,
+            subreddit='sub',
+            url=f"https://reddit.com{permalink}",
+            author=author,
+            category='tech',
+        )
+        posts.append(post)
+        sources.append(post)
+    return posts, sources
+
+
+def measure(builder, raw):
+    tracemalloc.start()
+    result = builder(raw)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    raw = _raw_posts(n)
+
+    dict_bytes = measure(build_dicts, raw)
+    record_bytes = measure(build_records, raw)
+
+    print(f"posts: {n}")
+    print(f"  dicts:   {dict_bytes / 1e6:8.1f} MB ({dict_bytes / n:.0f} B/post)")
+    print(f"  records: {record_bytes / 1e6:8.1f} MB ({record_bytes / n:.0f} B/post)")
+    print(f"  saving:  {(1 - record_bytes / dict_bytes) * 100:.0f}%")
+
+
+if __name__ == '__main__':
+    main()
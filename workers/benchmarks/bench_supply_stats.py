@@ -0,0 +1,75 @@
+"""Micro-benchmark: multi-pass vs single-pass YouTube supply aggregation.
+
+Compares the previous list-comprehension/sort implementation against
+SupplyAggregator for a single search page and for paged result sets. The
+VideoStat records are built up front, since check_supply creates them either
+way; only the aggregation work is timed.
+
+    python benchmarks/bench_supply_stats.py
+"""
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from collectors.youtube_stats import SupplyAggregator
+from records import VideoStat
+
+
+def multi_pass(videos_data, matches):
+    ages_days = []
+    channel_sizes = []
+    title_matches = 0
+    for video, title_match in zip(videos_data, matches):
+        if title_match:
+            title_matches += 1
+        ages_days.append(video.age_days)
+        channel_sizes.append(video.subs)
+    total_videos = len(videos_data)
+    return {
+        'results_last_7_days': len([v for v in videos_data if v.age_days <= 7]),
+        'results_last_30_days': len([v for v in videos_data if v.age_days <= 30]),
+        'results_last_90_days': len([v for v in videos_data if v.age_days <= 90]),
+        'avg_video_age_days': sum(ages_days) / len(ages_days) if ages_days else 0,
+        'median_video_age_days': sorted(ages_days)[len(ages_days)//2] if ages_days else 0,
+        'title_match_ratio': title_matches / total_videos if total_videos else 0,
+        'avg_channel_subscribers': sum(channel_sizes) / len(channel_sizes) if channel_sizes else 0,
+        'median_channel_subscribers': sorted(channel_sizes)[len(channel_sizes)//2] if channel_sizes else 0,
+        'large_channel_count': len([s for s in channel_sizes if s > 100000]),
+        'small_channel_count': len([s for s in channel_sizes if s < 10000]),
+    }
+
+
+def single_pass(videos_data, matches):
+    stats = SupplyAggregator()
+    add_age, add_subs = stats.ages.append, stats.subs.append
+    title_matches = 0
+    for video, title_match in zip(videos_data, matches):
+        if title_match:
+            title_matches += 1
+        add_age(video.age_days)
+        add_subs(video.subs)
+    stats.title_matches = title_matches
+    return stats.metrics()
+
+
+def main():
+    rnd = random.Random(42)
+    for n in (50, 500, 5000, 50000):
+        videos_data = [
+            VideoStat(f"v{i}", 'title', 'channel', 0, int(rnd.lognormvariate(9, 2.5)), rnd.randint(0, 2000), 0)
+            for i in range(n)
+        ]
+        matches = [rnd.random() < 0.4 for _ in range(n)]
+        assert multi_pass(videos_data, matches) == single_pass(videos_data, matches)
+
+        number = max(1, 200000 // n)
+        old = min(timeit.repeat(lambda: multi_pass(videos_data, matches), number=number, repeat=15)) / number
+        new = min(timeit.repeat(lambda: single_pass(videos_data, matches), number=number, repeat=15)) / number
+        print(f"n={n:>6}: multi-pass {old * 1e6:9.1f} us, single-pass {new * 1e6:9.1f} us ({old / new:.2f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,196 @@
+"""Per-host circuit breakers and an overall scan deadline for collector calls.
+
+Every outbound collector call goes through `ScanGuard.call()` (the HTTP client,
+pytrends and the YouTube API client do this). After `failure_threshold`
+consecutive failures a host's breaker opens and its remaining calls raise
+CircuitOpenError immediately instead of waiting out another timeout; after
+`reset_timeout` seconds one probe call is let through (half-open) and a
+success closes the breaker again. Once the scan deadline passes every call
+raises DeadlineExceeded, and per-call timeouts are clipped to the time left,
+so a degraded source costs at most a few timeouts rather than one per call.
+"""
+import threading
+import time
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitOpenError(Exception):
+    """The call was skipped: its host's breaker is open"""
+
+    def __init__(self, host, message=None):
+        super().__init__(message or f"circuit open for {host}")
+        self.host = host
+
+
+class DeadlineExceeded(CircuitOpenError):
+    """The call was skipped: the scan deadline has passed"""
+
+    def __init__(self, host):
+        super().__init__(host, f"scan deadline reached, skipping {host}")
+
+
+class CircuitBreaker:
+    def __init__(self, host, failure_threshold=3, reset_timeout=60):
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.calls = 0
+        self.failures = 0
+        self.skipped = 0
+        self.trips = 0
+        self.opened_at = None
+        self.last_error = None
+
+    def allow(self, now):
+        if self.state == OPEN and now - self.opened_at >= self.reset_timeout:
+            self.state = HALF_OPEN
+            return True
+        return self.state == CLOSED
+
+    def success(self):
+        self.calls += 1
+        self.consecutive_failures = 0
+        self.state = CLOSED
+
+    def failure(self, error, now):
+        self.calls += 1
+        self.failures += 1
+        self.consecutive_failures += 1
+        self.last_error = str(error)[:200]
+        if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            if self.state != OPEN:
+                self.trips += 1
+            self.state = OPEN
+            self.opened_at = now
+
+    def to_dict(self):
+        return {
+            'host': self.host,
+            'state': self.state,
+            'calls': self.calls,
+            'failures': self.failures,
+            'skipped': self.skipped,
+            'trips': self.trips,
+            'last_error': self.last_error
+        }
+
+
+class ScanGuard:
+    def __init__(self, deadline_seconds=None, failure_threshold=3, reset_timeout=60):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.breakers = {}  # host -> CircuitBreaker
+        self.deadline = None
+        self.deadline_seconds = None
+        self.deadline_hit = False
+        self._lock = threading.Lock()
+        self.reset(deadline_seconds)
+
+    def reset(self, deadline_seconds=None):
+        """Start a new scan: close every breaker and restart the deadline clock"""
+        with self._lock:
+            self.breakers = {}
+            self.deadline_seconds = deadline_seconds or None
+            self.deadline = time.monotonic() + deadline_seconds if deadline_seconds else None
+            self.deadline_hit = False
+
+    def remaining(self):
+        """Seconds left before the scan deadline, or None without one"""
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.monotonic())
+
+    def timeout(self, default):
+        """Per-call timeout clipped to the time left in the scan"""
+        remaining = self.remaining()
+        return default if remaining is None else min(default, max(remaining, 0.1))
+
+    def _breaker(self, host):
+        breaker = self.breakers.get(host)
+        if breaker is None:
+            breaker = self.breakers[host] = CircuitBreaker(host, self.failure_threshold, self.reset_timeout)
+        return breaker
+
+    def before(self, host):
+        """Raise instead of calling host if its breaker is open or the deadline passed"""
+        with self._lock:
+            breaker = self._breaker(host)
+            if self.deadline is not None and time.monotonic() >= self.deadline:
+                self.deadline_hit = True
+                breaker.skipped += 1
+                raise DeadlineExceeded(host)
+            if not breaker.allow(time.monotonic()):
+                breaker.skipped += 1
+                raise CircuitOpenError(host)
+
+    def success(self, host):
+        with self._lock:
+            self._breaker(host).success()
+
+    def failure(self, host, error):
+        with self._lock:
+            breaker = self._breaker(host)
+            was_open = breaker.state == OPEN
+            breaker.failure(error, time.monotonic())
+            tripped = breaker.state == OPEN and not was_open
+        if tripped:
+            print(f"  Circuit opened for {host} after {breaker.consecutive_failures} failures: {breaker.last_error}")
+
+    def call(self, host, fn, *args, is_failure=None, **kwargs):
+        """Run fn through host's breaker
+
+        is_failure(result) may return an error description for a response
+        that came back but means the host is unhealthy (5xx, 429).
+        """
+        self.before(host)
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as e:
+            self.failure(host, e)
+            raise
+        error = is_failure(result) if is_failure else None
+        if error:
+            self.failure(host, error)
+        else:
+            self.success(host)
+        return result
+
+    def states(self):
+        with self._lock:
+            return {host: breaker.to_dict() for host, breaker in self.breakers.items()}
+
+    def report(self):
+        """scan_log error entries for degraded hosts and a missed deadline"""
+        entries = []
+        for host, state in sorted(self.states().items()):
+            if state['failures'] or state['skipped']:
+                entries.append(dict(state, type='circuit_breaker',
+                                    message=f"{host}: {state['failures']} failed, "
+                                            f"{state['skipped']} skipped calls (breaker {state['state']})"))
+        if self.deadline_hit:
+            entries.append({
+                'type': 'deadline',
+                'deadline_seconds': self.deadline_seconds,
+                'message': f"scan deadline of {self.deadline_seconds}s reached; remaining external calls skipped"
+            })
+        return entries
+
+
+_shared_guard = None
+_shared_lock = threading.Lock()
+
+
+def get_scan_guard():
+    """Process-wide guard shared by every collector; run_scan resets it per scan"""
+    global _shared_guard
+    with _shared_lock:
+        if _shared_guard is None:
+            from config import CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RESET_SECONDS
+            _shared_guard = ScanGuard(failure_threshold=CIRCUIT_FAILURE_THRESHOLD,
+                                      reset_timeout=CIRCUIT_RESET_SECONDS)
+        return _shared_guard
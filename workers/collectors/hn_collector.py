@@ -1,20 +1,25 @@
 import requests
-from datetime import datetime, timezone
+
+from collectors.circuit_breaker import CircuitOpenError
+from collectors.http_cache import get_http_client
+from records import HNStory
 
 class HackerNewsCollector:
     BASE_URL = "https://hacker-news.firebaseio.com/v0"
+    REQUEST_TIMEOUT = 10  # seconds, clipped to the scan deadline by the HTTP client
 
-    def __init__(self, supabase_client):
+    def __init__(self, supabase_client, http=None):
         self.supabase = supabase_client
+        self.http = http or get_http_client()
 
     def get_item(self, item_id):
         """Fetch a single HN item"""
-        response = requests.get(f"{self.BASE_URL}/item/{item_id}.json")
+        response = self.http.get(f"{self.BASE_URL}/item/{item_id}.json", timeout=self.REQUEST_TIMEOUT)
         return response.json() if response.ok else None
 
     def collect_top_stories(self, limit=100):
         """Collect top stories from Hacker News"""
-        response = requests.get(f"{self.BASE_URL}/topstories.json")
+        response = self.http.get(f"{self.BASE_URL}/topstories.json", timeout=self.REQUEST_TIMEOUT)
         if not response.ok:
             return []
 
@@ -22,22 +27,30 @@ class HackerNewsCollector:
         stories = []
 
         for story_id in story_ids:
-            item = self.get_item(story_id)
+            try:
+                item = self.get_item(story_id)
+            except CircuitOpenError as e:
+                print(f"  Skipping remaining HN items: {e}")
+                break
+            except requests.RequestException as e:
+                print(f"  Error fetching HN item {story_id}: {e}")
+                continue
             if item and item.get('type') == 'story' and item.get('score', 0) >= 50:
-                stories.append({
-                    'title': item.get('title', ''),
-                    'score': item.get('score', 0),
-                    'url': item.get('url', f"https://news.ycombinator.com/item?id={story_id}"),
-                    'hn_url': f"https://news.ycombinator.com/item?id={story_id}",
-                    'num_comments': item.get('descendants', 0),
-                    'created_utc': datetime.fromtimestamp(item.get('time', 0), tz=timezone.utc).isoformat()
-                })
+                hn_url = f"https://news.ycombinator.com/item?id={story_id}"
+                stories.append(HNStory(
+                    title=item.get('title', ''),
+                    score=item.get('score', 0),
+                    url=item.get('url', hn_url),
+                    hn_url=hn_url,
+                    num_comments=item.get('descendants', 0),
+                    created_utc=item.get('time', 0)
+                ))
 
         return stories
 
-    def run(self):
+    def run(self, limit=100):
         """Main collection run"""
         print("Starting Hacker News collection...")
-        stories = self.collect_top_stories()
+        stories = self.collect_top_stories(limit=limit)
         print(f"HN collection complete: {len(stories)} stories")
         return stories
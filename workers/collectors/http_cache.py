@@ -0,0 +1,212 @@
+"""Shared HTTP layer for collectors with a persistent conditional-request cache.
+
+Responses are stored on disk keyed by URL + params. Within an endpoint's TTL a
+cached body is returned without touching the network; after that the request
+is sent with If-None-Match / If-Modified-Since and a 304 refreshes the entry.
+"""
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from urllib.parse import urlencode, urlsplit
+
+import requests
+
+from collectors.circuit_breaker import get_scan_guard
+
+# First matching pattern wins; TTL in seconds (0 = always revalidate)
+ENDPOINT_TTLS = [
+    ('hn_topstories', re.compile(r'hacker-news\.firebaseio\.com/v0/topstories\.json'), 60),
+    ('hn_item', re.compile(r'hacker-news\.firebaseio\.com/v0/item/'), 300),
+    ('reddit_listing', re.compile(r'reddit\.com/r/[^/]+/(rising|hot)\.json'), 120),
+    ('reddit_search', re.compile(r'reddit\.com/search\.json'), 600),
+]
+DEFAULT_ENDPOINT = 'other'
+DEFAULT_TTL = 0
+CACHED_HEADERS = ('ETag', 'Last-Modified', 'Content-Type', 'Cache-Control')
+
+
+class CachedResponse:
+    """Minimal requests.Response stand-in returned by CachedHTTPClient
+
+    from_cache: the body came from the cache (a fresh hit or a 304).
+    fresh: served within the TTL without touching the network.
+    """
+
+    def __init__(self, url, status_code, content, headers, from_cache=False, fresh=False):
+        self.url = url
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers
+        self.from_cache = from_cache
+        self.fresh = fresh
+
+    @property
+    def ok(self):
+        return self.status_code < 400
+
+    def json(self):
+        return json.loads(self.content)
+
+    def raise_for_status(self):
+        if not self.ok:
+            raise requests.HTTPError(f"{self.status_code} Error for url: {self.url}")
+
+
+def _unhealthy(response):
+    if response.status_code >= 500 or response.status_code == 429:
+        return f"HTTP {response.status_code}"
+    return None
+
+
+class CachedHTTPClient:
+    def __init__(self, cache_dir=None, endpoint_ttls=None, session=None, guard=None):
+        self.cache_dir = cache_dir
+        self.endpoint_ttls = ENDPOINT_TTLS if endpoint_ttls is None else endpoint_ttls
+        self.session = session or requests.Session()
+        self.guard = guard  # ScanGuard: per-host circuit breakers and the scan deadline
+        self.stats = {}  # endpoint -> {'fresh': n, 'revalidated': n, 'miss': n}
+        self._lock = threading.Lock()
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def _endpoint(self, url):
+        for name, pattern, ttl in self.endpoint_ttls:
+            if pattern.search(url):
+                return name, ttl
+        return DEFAULT_ENDPOINT, DEFAULT_TTL
+
+    def _record(self, endpoint, outcome):
+        with self._lock:
+            counts = self.stats.setdefault(endpoint, {'fresh': 0, 'revalidated': 0, 'miss': 0})
+            counts[outcome] += 1
+
+    def _path(self, url, params):
+        key = url + ('?' + urlencode(sorted(params.items())) if params else '')
+        return os.path.join(self.cache_dir, hashlib.sha1(key.encode()).hexdigest() + '.json')
+
+    def _load(self, path):
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _store(self, path, entry):
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"  Warning: could not write HTTP cache entry: {e}")
+
+    def _fetch(self, url, params, headers, timeout):
+        if self.guard is None:
+            return self.session.get(url, params=params, headers=headers, timeout=timeout)
+        return self.guard.call(urlsplit(url).netloc, self.session.get, url, params=params,
+                               headers=headers, timeout=self.guard.timeout(timeout),
+                               is_failure=_unhealthy)
+
+    def get(self, url, params=None, headers=None, timeout=10, ttl=None):
+        """GET with disk caching; returns a CachedResponse
+
+        Fresh cache hits are served even while the host's circuit is open;
+        anything that needs the network raises CircuitOpenError instead.
+        """
+        endpoint, endpoint_ttl = self._endpoint(url)
+        ttl = endpoint_ttl if ttl is None else ttl
+
+        if not self.cache_dir:
+            response = self._fetch(url, params, headers, timeout)
+            self._record(endpoint, 'miss')
+            return CachedResponse(url, response.status_code, response.content, response.headers)
+
+        path = self._path(url, params)
+        entry = self._load(path)
+        now = time.time()
+
+        if entry and now - entry['stored_at'] < ttl:
+            self._record(endpoint, 'fresh')
+            return CachedResponse(url, entry['status'], entry['body'].encode(), entry['headers'],
+                                  from_cache=True, fresh=True)
+
+        request_headers = dict(headers or {})
+        if entry:
+            if entry['headers'].get('ETag'):
+                request_headers['If-None-Match'] = entry['headers']['ETag']
+            if entry['headers'].get('Last-Modified'):
+                request_headers['If-Modified-Since'] = entry['headers']['Last-Modified']
+
+        response = self._fetch(url, params, request_headers, timeout)
+
+        if response.status_code == 304 and entry:
+            entry['stored_at'] = now
+            self._store(path, entry)
+            self._record(endpoint, 'revalidated')
+            return CachedResponse(url, entry['status'], entry['body'].encode(), entry['headers'], from_cache=True)
+
+        self._record(endpoint, 'miss')
+        response_headers = {
+            k: response.headers[k] for k in CACHED_HEADERS if k in response.headers
+        }
+        if response.ok and 'no-store' not in response.headers.get('Cache-Control', ''):
+            self._store(path, {
+                'stored_at': now,
+                'status': response.status_code,
+                'headers': response_headers,
+                'body': response.text
+            })
+        return CachedResponse(url, response.status_code, response.content, response_headers)
+
+    def prune(self, max_age=7 * 86400):
+        """Drop cache entries not refreshed within max_age seconds"""
+        if not self.cache_dir:
+            return 0
+        cutoff = time.time() - max_age
+        removed = 0
+        try:
+            for entry in os.scandir(self.cache_dir):
+                if entry.stat().st_mtime < cutoff:
+                    os.remove(entry.path)
+                    removed += 1
+        except OSError as e:
+            print(f"  Warning: could not prune HTTP cache: {e}")
+        return removed
+
+    def reset_stats(self):
+        with self._lock:
+            self.stats = {}
+
+    def hit_rates(self):
+        """Per-endpoint share of requests answered without a full body download"""
+        with self._lock:
+            rates = {}
+            for endpoint, counts in self.stats.items():
+                total = sum(counts.values())
+                rates[endpoint] = (counts['fresh'] + counts['revalidated']) / total if total else 0
+            return rates
+
+    def print_stats(self):
+        with self._lock:
+            stats = {k: dict(v) for k, v in self.stats.items()}
+        rates = self.hit_rates()
+        for endpoint, counts in sorted(stats.items()):
+            print(f"  {endpoint}: {rates[endpoint]:.0%} cached "
+                  f"(fresh {counts['fresh']}, revalidated {counts['revalidated']}, miss {counts['miss']})")
+
+
+_shared_client = None
+_shared_lock = threading.Lock()
+
+
+def get_http_client():
+    """Process-wide client so daemon-mode scans share one cache, its stats and the scan guard"""
+    global _shared_client
+    with _shared_lock:
+        if _shared_client is None:
+            from config import HTTP_CACHE_DIR
+            _shared_client = CachedHTTPClient(HTTP_CACHE_DIR or None, guard=get_scan_guard())
+        return _shared_client
@@ -1,15 +1,19 @@
-import requests
 import time
 from datetime import datetime, timezone
 from typing import List, Dict
 
+from collectors.circuit_breaker import CircuitOpenError
+from collectors.http_cache import get_http_client
+from records import RedditPost
+
 class RedditCollector:
     """Reddit data collector using public JSON endpoints (no API key needed)"""
 
     BASE_URL = "https://www.reddit.com"
 
-    def __init__(self, supabase_client):
+    def __init__(self, supabase_client, http=None):
         self.supabase = supabase_client
+        self.http = http or get_http_client()
         self.headers = {'User-Agent': 'NicheRadar/1.0 (Trend Detection Tool)'}
         self.request_delay = 2  # seconds between requests
 
@@ -18,20 +22,37 @@ class RedditCollector:
         url = f"{self.BASE_URL}{endpoint}"
 
         try:
-            response = requests.get(url, params=params, headers=self.headers, timeout=10)
+            response = self.http.get(url, params=params, headers=self.headers, timeout=10)
+            # A 304 or an error status still cost Reddit a request
+            if not response.fresh:
+                time.sleep(self.request_delay)
             response.raise_for_status()
-            time.sleep(self.request_delay)
             return response.json()
+        except CircuitOpenError:
+            raise
         except Exception as e:
             print(f"  Error fetching {endpoint}: {e}")
             return {}
 
+    @staticmethod
+    def _to_post(p: dict, subreddit: str) -> RedditPost:
+        return RedditPost(
+            title=p['title'],
+            score=p['score'],
+            upvote_ratio=p.get('upvote_ratio', 0),
+            num_comments=p['num_comments'],
+            created_utc=int(p['created_utc']),
+            subreddit=subreddit,
+            url=f"https://reddit.com{p['permalink']}",
+            author=p.get('author', ''),
+        )
+
     def get_configured_subreddits(self) -> List[Dict]:
         """Fetch active subreddits from config table"""
         result = self.supabase.table('subreddit_config').select('*').eq('is_active', True).execute()
         return result.data
 
-    def collect_rising_posts(self, subreddit: str, min_score: int = 50, limit: int = 50) -> List[Dict]:
+    def collect_rising_posts(self, subreddit: str, min_score: int = 50, limit: int = 50) -> List[RedditPost]:
         """Get rising posts from a subreddit - the key signal for emerging trends."""
         posts = []
 
@@ -41,16 +62,7 @@ class RedditCollector:
         for post in data.get('data', {}).get('children', []):
             p = post['data']
             if p.get('score', 0) >= min_score:
-                posts.append({
-                    'title': p['title'],
-                    'score': p['score'],
-                    'upvote_ratio': p.get('upvote_ratio', 0),
-                    'num_comments': p['num_comments'],
-                    'created_utc': datetime.fromtimestamp(p['created_utc'], tz=timezone.utc).isoformat(),
-                    'subreddit': subreddit,
-                    'url': f"https://reddit.com{p['permalink']}",
-                    'author': p.get('author', ''),
-                })
+                posts.append(self._to_post(p, subreddit))
 
         # Also get hot posts for sustained trends
         data = self._get(f"/r/{subreddit}/hot.json", {'limit': limit})
@@ -59,20 +71,11 @@ class RedditCollector:
             p = post['data']
             # Hot posts need higher threshold
             if p.get('score', 0) >= min_score * 2:
-                posts.append({
-                    'title': p['title'],
-                    'score': p['score'],
-                    'upvote_ratio': p.get('upvote_ratio', 0),
-                    'num_comments': p['num_comments'],
-                    'created_utc': datetime.fromtimestamp(p['created_utc'], tz=timezone.utc).isoformat(),
-                    'subreddit': subreddit,
-                    'url': f"https://reddit.com{p['permalink']}",
-                    'author': p.get('author', ''),
-                })
+                posts.append(self._to_post(p, subreddit))
 
         return posts
 
-    def run(self) -> List[Dict]:
+    def run(self) -> List[RedditPost]:
         """Main collection run"""
         print("Starting Reddit collection (JSON endpoint)...")
 
@@ -84,11 +87,15 @@ class RedditCollector:
             min_score = config.get('min_score', 50)
             category = config.get('category', 'uncategorised')
 
-            posts = self.collect_rising_posts(subreddit, min_score=min_score)
+            try:
+                posts = self.collect_rising_posts(subreddit, min_score=min_score)
+            except CircuitOpenError as e:
+                print(f"  Skipping remaining subreddits: {e}")
+                break
 
             # Add category to each post
             for post in posts:
-                post['category'] = category
+                post.category = category
 
             all_posts.extend(posts)
             print(f"  r/{subreddit}: {len(posts)} posts")
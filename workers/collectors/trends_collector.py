@@ -1,10 +1,20 @@
 from pytrends.request import TrendReq
 import time
 
+from collectors.circuit_breaker import CircuitOpenError, get_scan_guard
+from config import API_TIMEOUT_SECONDS
+from records import TrendQuery
+
+TRENDS_HOST = 'trends.google.com'
+
+
 class GoogleTrendsCollector:
-    def __init__(self, supabase_client):
+    def __init__(self, supabase_client, guard=None):
         self.supabase = supabase_client
-        self.pytrends = TrendReq(hl='en-US', tz=360)
+        self.guard = guard or get_scan_guard()
+        # TrendReq fetches a session cookie on construction, so it goes through the breaker too
+        self.pytrends = self.guard.call(TRENDS_HOST, TrendReq, hl='en-US', tz=360,
+                                        timeout=(5, API_TIMEOUT_SECONDS))
 
     def get_seed_keywords(self):
         """Fetch active seed keywords from config table"""
@@ -14,17 +24,22 @@ class GoogleTrendsCollector:
     def get_related_queries(self, keyword):
         """Get related rising queries for a keyword"""
         try:
-            self.pytrends.build_payload([keyword], timeframe='now 7-d')
-            related = self.pytrends.related_queries()
+            related = self.guard.call(TRENDS_HOST, self._related_queries, keyword)
 
             rising = related.get(keyword, {}).get('rising')
             if rising is not None and not rising.empty:
                 return rising.to_dict('records')
             return []
+        except CircuitOpenError:
+            raise
         except Exception as e:
             print(f"Error getting trends for '{keyword}': {e}")
             return []
 
+    def _related_queries(self, keyword):
+        self.pytrends.build_payload([keyword], timeframe='now 7-d')
+        return self.pytrends.related_queries()
+
     def run(self):
         """Main collection run"""
         print("Starting Google Trends collection...")
@@ -32,11 +47,19 @@ class GoogleTrendsCollector:
         all_queries = []
 
         for kw in keywords:
-            queries = self.get_related_queries(kw['keyword'])
+            try:
+                queries = self.get_related_queries(kw['keyword'])
+            except CircuitOpenError as e:
+                print(f"  Skipping remaining seed keywords: {e}")
+                break
+            category = kw.get('category', 'uncategorised')
             for q in queries:
-                q['seed_keyword'] = kw['keyword']
-                q['category'] = kw.get('category', 'uncategorised')
-            all_queries.extend(queries)
+                all_queries.append(TrendQuery(
+                    query=q.get('query', ''),
+                    value=q.get('value', 0),
+                    seed_keyword=kw['keyword'],
+                    category=category
+                ))
             time.sleep(1)  # Rate limiting
 
         print(f"Trends collection complete: {len(all_queries)} related queries")
@@ -1,135 +1,276 @@
 import os
 import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
+import httplib2
 from googleapiclient.discovery import build
 
+from collectors.circuit_breaker import CircuitOpenError, get_scan_guard
+from collectors.youtube_stats import SupplyAggregator
+from config import API_TIMEOUT_SECONDS
+from records import VideoStat
+
 YOUTUBE_API_KEY = os.getenv('YOUTUBE_API_KEY')
+CHANNELS_PER_REQUEST = 50  # channels.list id limit
+RESULTS_PER_PAGE = 50  # search.list maxResults / videos.list id limit
+YOUTUBE_HOST = 'www.googleapis.com'
+
+
+def _build_service(**kwargs):
+    # httplib2 has no timeout by default; a hung request would stall its worker for good
+    return build('youtube', 'v3', developerKey=YOUTUBE_API_KEY,
+                 http=httplib2.Http(timeout=API_TIMEOUT_SECONDS), **kwargs)
+
 
 class YouTubeCollector:
-    def __init__(self, supabase_client):
+    def __init__(self, supabase_client, max_results=50, guard=None):
         self.supabase = supabase_client
+        self.guard = guard or get_scan_guard()
+        self.max_results = max_results  # search results analysed per keyword
+        self.channel_subs = {}  # channel_id -> subscribers, shared by every check in a scan
+        self.channel_requests = 0
+        self.api_requests = 0
+        self._local = threading.local()
+        self._lock = threading.Lock()
         if YOUTUBE_API_KEY:
-            self.youtube = build('youtube', 'v3', developerKey=YOUTUBE_API_KEY)
+            self.youtube = _build_service()
         else:
             self.youtube = None
             print("Warning: YOUTUBE_API_KEY not set, YouTube checks will be skipped")
 
+    def _service(self):
+        """API client for the current thread (googleapiclient is not thread-safe)"""
+        if threading.current_thread() is threading.main_thread():
+            return self.youtube
+        service = getattr(self._local, 'youtube', None)
+        if service is None:
+            service = _build_service(cache_discovery=False)
+            self._local.youtube = service
+        return service
+
+    def _search(self, keyword):
+        """Search results and their video details for a keyword"""
+        youtube = self._service()
+
+        # Page through search results until max_results videos are collected
+        items = []
+        search_response = None
+        page_token = None
+        while len(items) < self.max_results:
+            page = self._execute(youtube.search().list(
+                q=keyword,
+                part='snippet',
+                type='video',
+                maxResults=min(RESULTS_PER_PAGE, self.max_results - len(items)),
+                order='relevance',
+                pageToken=page_token
+            ))
+            search_response = search_response or page
+            items.extend(page.get('items', []))
+            page_token = page.get('nextPageToken')
+            if not page_token:
+                break
+        search_response = dict(search_response, items=items)
+
+        if not items:
+            return search_response, None
+
+        video_ids = [item['id']['videoId'] for item in items]
+
+        # Batch fetch video stats
+        videos = []
+        for i in range(0, len(video_ids), RESULTS_PER_PAGE):
+            videos_response = self._execute(youtube.videos().list(
+                id=','.join(video_ids[i:i + RESULTS_PER_PAGE]),
+                part='statistics,snippet'
+            ))
+            videos.extend(videos_response.get('items', []))
+
+        return search_response, {'items': videos}
+
+    def _execute(self, request):
+        """Execute an API request through the googleapis.com circuit breaker"""
+        response = self.guard.call(YOUTUBE_HOST, request.execute)
+        with self._lock:
+            self.api_requests += 1
+        return response
+
+    @staticmethod
+    def _channel_ids(search_response):
+        return set(item['snippet']['channelId'] for item in search_response.get('items', []))
+
+    def _fetch_channel_batch(self, channel_ids):
+        channels_response = self._execute(self._service().channels().list(
+            id=','.join(channel_ids),
+            part='statistics'
+        ))
+
+        # Build channel subscriber lookup
+        channel_subs = {}
+        for ch in channels_response.get('items', []):
+            subs = int(ch['statistics'].get('subscriberCount', 0))
+            if ch['statistics'].get('hiddenSubscriberCount'):
+                subs = 0
+            channel_subs[ch['id']] = subs
+        return channel_subs
+
+    def fetch_channel_subs(self, channel_ids, executor=None):
+        """Fetch subscriber counts for channels not yet in the pool, in batches of 50"""
+        with self._lock:
+            missing = sorted(set(channel_ids) - self.channel_subs.keys())
+
+        batches = [missing[i:i + CHANNELS_PER_REQUEST]
+                   for i in range(0, len(missing), CHANNELS_PER_REQUEST)]
+        if executor and len(batches) > 1:
+            results = executor.map(self._fetch_channel_batch, batches)
+        else:
+            results = map(self._fetch_channel_batch, batches)
+
+        for batch, subs in zip(batches, results):
+            with self._lock:
+                self.channel_requests += 1
+                self.channel_subs.update(subs)
+                # Channels the API did not return (deleted/terminated) count as 0
+                for channel_id in batch:
+                    self.channel_subs.setdefault(channel_id, 0)
+
+        return self.channel_subs
+
     def check_supply(self, keyword):
         """Analyze YouTube supply/competition for a keyword"""
         if not self.youtube:
             return None
 
         try:
-            # Search for keyword
-            search_response = self.youtube.search().list(
-                q=keyword,
-                part='snippet',
-                type='video',
-                maxResults=50,
-                order='relevance'
-            ).execute()
-
-            if not search_response.get('items'):
+            search_response, videos_response = self._search(keyword)
+            if videos_response is None:
                 return self._empty_result()
 
-            video_ids = [item['id']['videoId'] for item in search_response['items']]
-            channel_ids = list(set(item['snippet']['channelId'] for item in search_response['items']))
+            self.fetch_channel_subs(self._channel_ids(search_response))
+            return self._analyze(keyword, search_response, videos_response)
 
-            # Batch fetch video stats
-            videos_response = self.youtube.videos().list(
-                id=','.join(video_ids),
-                part='statistics,snippet'
-            ).execute()
-
-            # Batch fetch channel stats
-            channels_response = self.youtube.channels().list(
-                id=','.join(channel_ids[:50]),
-                part='statistics'
-            ).execute()
-
-            # Build channel subscriber lookup
-            channel_subs = {}
-            for ch in channels_response.get('items', []):
-                subs = int(ch['statistics'].get('subscriberCount', 0))
-                if ch['statistics'].get('hiddenSubscriberCount'):
-                    subs = 0
-                channel_subs[ch['id']] = subs
-
-            # Analyze results
-            now = datetime.now(timezone.utc)
-            keyword_lower = keyword.lower()
-
-            videos_data = []
-            outliers = []
-            title_matches = 0
-            ages_days = []
-            channel_sizes = []
-
-            for video in videos_response.get('items', []):
-                vid_id = video['id']
-                title = video['snippet']['title']
-                channel_id = video['snippet']['channelId']
-                published = datetime.fromisoformat(
-                    video['snippet']['publishedAt'].replace('Z', '+00:00')
-                )
-                views = int(video['statistics'].get('viewCount', 0))
-
-                age_days = (now - published).days
-                subs = channel_subs.get(channel_id, 0)
-
-                # Check title match
-                if keyword_lower in title.lower():
-                    title_matches += 1
-
-                ages_days.append(age_days)
-                channel_sizes.append(subs)
-
-                # Calculate VPS ratio
-                vps_ratio = views / (subs + 1)
-
-                # Detect outliers: small channel (<10k), high VPS (>5), recent (<90 days)
-                if subs < 10000 and vps_ratio > 5 and age_days < 90:
-                    outliers.append({
-                        'video_id': vid_id,
-                        'title': title,
-                        'views': views,
-                        'subs': subs,
-                        'vps_ratio': round(vps_ratio, 2),
-                        'age_days': age_days
-                    })
-
-                videos_data.append({
+        except Exception as e:
+            print(f"Error checking YouTube supply for '{keyword}': {e}")
+            return None
+
+    def check_supply_many(self, keywords, workers=8):
+        """Pipelined supply check: concurrent searches, then one pooled channel lookup
+
+        Returns {keyword: supply data, or None on failure}.
+        """
+        if not self.youtube:
+            return {kw: None for kw in keywords}
+
+        searched = {}
+        skipped = []
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            futures = {kw: executor.submit(self._search, kw) for kw in keywords}
+            for kw, future in futures.items():
+                try:
+                    searched[kw] = future.result()
+                except CircuitOpenError as e:
+                    skipped.append(e)
+                    searched[kw] = None
+                except Exception as e:
+                    print(f"Error checking YouTube supply for '{kw}': {e}")
+                    searched[kw] = None
+
+            if skipped:
+                print(f"Skipped {len(skipped)} YouTube searches: {skipped[-1]}")
+
+            channel_ids = set()
+            for result in searched.values():
+                if result:
+                    channel_ids |= self._channel_ids(result[0])
+            try:
+                self.fetch_channel_subs(channel_ids, executor)
+            except Exception as e:
+                # Keep going with whatever was fetched; unknown channels count as 0 subs
+                print(f"Error fetching YouTube channel stats: {e}")
+
+        results = {}
+        for kw in keywords:
+            result = searched.get(kw)
+            if result is None:
+                results[kw] = None
+            elif result[1] is None:
+                results[kw] = self._empty_result()
+            else:
+                try:
+                    results[kw] = self._analyze(kw, *result)
+                except Exception as e:
+                    print(f"Error checking YouTube supply for '{kw}': {e}")
+                    results[kw] = None
+        return results
+
+    def _analyze(self, keyword, search_response, videos_response):
+        """Supply metrics for one keyword from its search and video responses"""
+        channel_subs = self.channel_subs
+
+        # Analyze results
+        now = datetime.now(timezone.utc)
+        keyword_lower = keyword.lower()
+
+        videos_data = []
+        outliers = []
+        stats = SupplyAggregator()
+        # Bound appends keep the per-video cost of the single pass minimal
+        add_age, add_subs = stats.ages.append, stats.subs.append
+        title_matches = 0
+
+        for video in videos_response.get('items', []):
+            vid_id = video['id']
+            title = video['snippet']['title']
+            channel_id = video['snippet']['channelId']
+            published = datetime.fromisoformat(
+                video['snippet']['publishedAt'].replace('Z', '+00:00')
+            )
+            views = int(video['statistics'].get('viewCount', 0))
+
+            age_days = (now - published).days
+            subs = channel_subs.get(channel_id, 0)
+
+            # Check title match
+            if keyword_lower in title.lower():
+                title_matches += 1
+
+            add_age(age_days)
+            add_subs(subs)
+
+            # Calculate VPS ratio
+            vps_ratio = views / (subs + 1)
+
+            # Detect outliers: small channel (<10k), high VPS (>5), recent (<90 days)
+            if subs < 10000 and vps_ratio > 5 and age_days < 90:
+                outliers.append({
                     'video_id': vid_id,
                     'title': title,
-                    'channel_id': channel_id,
                     'views': views,
                     'subs': subs,
-                    'age_days': age_days,
-                    'vps_ratio': round(vps_ratio, 2)
+                    'vps_ratio': round(vps_ratio, 2),
+                    'age_days': age_days
                 })
 
-            total_videos = len(videos_data)
-
-            return {
-                'total_results': search_response.get('pageInfo', {}).get('totalResults', 0),
-                'results_last_7_days': len([v for v in videos_data if v['age_days'] <= 7]),
-                'results_last_30_days': len([v for v in videos_data if v['age_days'] <= 30]),
-                'results_last_90_days': len([v for v in videos_data if v['age_days'] <= 90]),
-                'avg_video_age_days': sum(ages_days) / len(ages_days) if ages_days else 0,
-                'median_video_age_days': sorted(ages_days)[len(ages_days)//2] if ages_days else 0,
-                'title_match_ratio': title_matches / total_videos if total_videos else 0,
-                'avg_channel_subscribers': sum(channel_sizes) / len(channel_sizes) if channel_sizes else 0,
-                'median_channel_subscribers': sorted(channel_sizes)[len(channel_sizes)//2] if channel_sizes else 0,
-                'large_channel_count': len([s for s in channel_sizes if s > 100000]),
-                'small_channel_count': len([s for s in channel_sizes if s < 10000]),
-                'outlier_videos': outliers[:10],
-                'outlier_count': len(outliers),
-                'top_results': videos_data[:10]
-            }
+            videos_data.append(VideoStat(
+                video_id=vid_id,
+                title=title,
+                channel_id=channel_id,
+                views=views,
+                subs=subs,
+                age_days=age_days,
+                vps_ratio=round(vps_ratio, 2)
+            ))
 
-        except Exception as e:
-            print(f"Error checking YouTube supply for '{keyword}': {e}")
-            return None
+        stats.title_matches = title_matches
+        result = {'total_results': search_response.get('pageInfo', {}).get('totalResults', 0)}
+        result.update(stats.metrics())
+        result.update({
+            'outlier_videos': outliers[:10],
+            'outlier_count': len(outliers),
+            'top_results': [v.to_dict() for v in videos_data[:10]]
+        })
+        return result
 
     def _empty_result(self):
         return {
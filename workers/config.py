@@ -8,3 +8,36 @@ SUPABASE_KEY = os.getenv('SUPABASE_SERVICE_KEY')
 REDDIT_CLIENT_ID = os.getenv('REDDIT_CLIENT_ID')
 REDDIT_CLIENT_SECRET = os.getenv('REDDIT_CLIENT_SECRET')
 REDDIT_USER_AGENT = 'NicheRadar/1.0'
+
+# Local momentum history used for 24h/7d velocity tracking; keep it on a
+# persistent volume (the Dockerfile declares /app/data) or velocity starts cold
+SIGNAL_STORE_PATH = os.getenv('SIGNAL_STORE_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'signal_store.bin'))
+
+# Optional columnar export of every scan (disabled when unset)
+SCAN_EXPORT_DIR = os.getenv('SCAN_EXPORT_DIR')
+SCAN_EXPORT_FORMAT = os.getenv('SCAN_EXPORT_FORMAT', 'arrow')
+
+# Optional snapshot of each scan's title index (disabled when unset)
+TITLE_INDEX_PATH = os.getenv('TITLE_INDEX_PATH')
+
+# Disk cache for collector HTTP requests (set to empty to disable)
+HTTP_CACHE_DIR = os.getenv('HTTP_CACHE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'http_cache'))
+
+# Overall scan deadline for external calls in seconds (0 = none); past it,
+# remaining collector/API calls are skipped and the scan finishes with what it has
+SCAN_DEADLINE_SECONDS = float(os.getenv('SCAN_DEADLINE_SECONDS', '900'))
+# Consecutive failures before a host's calls are skipped, and how long until it is retried
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv('CIRCUIT_FAILURE_THRESHOLD', '3'))
+CIRCUIT_RESET_SECONDS = float(os.getenv('CIRCUIT_RESET_SECONDS', '60'))
+# Per-request timeout for pytrends and the YouTube API client
+API_TIMEOUT_SECONDS = float(os.getenv('API_TIMEOUT_SECONDS', '10'))
+
+# Concurrent YouTube searches during the supply check
+YOUTUBE_WORKERS = int(os.getenv('YOUTUBE_WORKERS', '8'))
+# Search results analysed per keyword; above 50 pages search.list (100 quota units per page)
+YOUTUBE_SEARCH_RESULTS = int(os.getenv('YOUTUBE_SEARCH_RESULTS', '50'))
+
+# Sampling profiler: fraction of scans profiled (0 = off, 0.1 = one in ten)
+PROFILE_SAMPLE_RATE = float(os.getenv('PROFILE_SAMPLE_RATE', '0'))
+PROFILE_INTERVAL_MS = float(os.getenv('PROFILE_INTERVAL_MS', '10'))
+PROFILE_DIR = os.getenv('PROFILE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'profiles'))
@@ -1,139 +1,44 @@
+import argparse
 import os
 import sys
-import re
 from datetime import datetime
 from supabase import create_client
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from config import SUPABASE_URL, SUPABASE_KEY
+from config import (
+    SUPABASE_URL, SUPABASE_KEY, SIGNAL_STORE_PATH, SCAN_EXPORT_DIR, SCAN_EXPORT_FORMAT, TITLE_INDEX_PATH,
+    YOUTUBE_WORKERS, YOUTUBE_SEARCH_RESULTS, PROFILE_SAMPLE_RATE, PROFILE_INTERVAL_MS, PROFILE_DIR,
+    SCAN_DEADLINE_SECONDS,
+)
 from collectors.reddit_collector import RedditCollector
 from collectors.hn_collector import HackerNewsCollector
 from collectors.trends_collector import GoogleTrendsCollector
 from collectors.youtube_collector import YouTubeCollector
+from collectors.http_cache import get_http_client
+from collectors.circuit_breaker import get_scan_guard
 from scoring.scorer import OpportunityScorer
+from scoring.velocity import SignalStore
+from processing import process_serial, process_parallel
+from title_index import TitleIndex
+from analytics.scan_export import ScanExporter
+from profiler import ScanProfiler, should_profile
+from dry_run import DryRunClient, PhaseThroughput
 
 
-def extract_keywords(text):
-    """Extract searchable keywords from text (title)"""
-    if not text:
-        return []
+def process_collected_data(supabase, reddit_posts, hn_stories, trend_queries, workers=1):
+    """Process raw collected data into topics and sources
 
-    # Remove common prefixes
-    text = re.sub(r'^(TIL|ELI5|CMV|TIFU|AMA|WIBTA|AITA|Show HN|Ask HN|Tell HN|Launch HN)\s*:?\s*', '', text, flags=re.IGNORECASE)
-
-    keywords = []
-
-    # Find quoted terms
-    quoted = re.findall(r'"([^"]+)"', text)
-    keywords.extend(quoted)
-
-    # Find capitalized phrases (2-4 words) - potential product/project names
-    phrases = re.findall(r'\b([A-Z][a-z]+(?:\s+[A-Z][a-z]+){0,3})\b', text)
-    keywords.extend(phrases)
-
-    # Also extract whole title if it's short enough and meaningful
-    clean_title = re.sub(r'[^\w\s]', '', text).strip()
-    if 3 <= len(clean_title.split()) <= 6:
-        keywords.append(clean_title)
-
-    # Normalize and deduplicate
-    normalized = []
-    seen = set()
-    for k in keywords:
-        k = k.lower().strip()
-        if len(k) > 3 and k not in seen and not k.isdigit():
-            seen.add(k)
-            normalized.append(k)
-
-    return normalized[:3]  # Max 3 keywords per item
-
-
-def normalize_keyword(keyword):
-    """Normalize keyword for deduplication"""
-    return re.sub(r'[^\w\s]', '', keyword.lower()).strip()
-
-
-def process_collected_data(supabase, reddit_posts, hn_stories, trend_queries):
-    """Process raw collected data into topics and sources"""
+    workers > 1 shards keyword extraction across a process pool (backfills);
+    the result is identical to the serial path.
+    """
     print("\n--- Processing collected data ---")
 
-    topics_map = {}  # keyword_normalized -> topic data
-
-    # Process Reddit posts
-    for post in reddit_posts:
-        keywords = extract_keywords(post['title'])
-        for kw in keywords:
-            kw_norm = normalize_keyword(kw)
-            if kw_norm not in topics_map:
-                topics_map[kw_norm] = {
-                    'keyword': kw,
-                    'keyword_normalised': kw_norm,
-                    'category': post.get('category', 'uncategorised'),
-                    'sources': []
-                }
-            topics_map[kw_norm]['sources'].append({
-                'source': 'reddit',
-                'source_url': post['url'],
-                'source_title': post['title'],
-                'source_metadata': {
-                    'subreddit': post.get('subreddit'),
-                    'score': post.get('score', 0),
-                    'num_comments': post.get('num_comments', 0)
-                }
-            })
-
-    # Process HN stories
-    for story in hn_stories:
-        keywords = extract_keywords(story['title'])
-        for kw in keywords:
-            kw_norm = normalize_keyword(kw)
-            if kw_norm not in topics_map:
-                topics_map[kw_norm] = {
-                    'keyword': kw,
-                    'keyword_normalised': kw_norm,
-                    'category': 'tech',
-                    'sources': []
-                }
-            topics_map[kw_norm]['sources'].append({
-                'source': 'hackernews',
-                'source_url': story['hn_url'],
-                'source_title': story['title'],
-                'source_metadata': {
-                    'score': story.get('score', 0),
-                    'num_comments': story.get('num_comments', 0)
-                }
-            })
-
-    # Process Google Trends queries
-    for query in trend_queries:
-        kw = query.get('query', '')
-        kw_norm = normalize_keyword(kw)
-        if not kw_norm:
-            continue
-
-        if kw_norm not in topics_map:
-            topics_map[kw_norm] = {
-                'keyword': kw,
-                'keyword_normalised': kw_norm,
-                'category': query.get('category', 'uncategorised'),
-                'sources': []
-            }
-
-        value = query.get('value', 0)
-        is_breakout = value == 'Breakout' if isinstance(value, str) else False
-
-        topics_map[kw_norm]['sources'].append({
-            'source': 'google_trends',
-            'source_url': f"https://trends.google.com/trends/explore?q={kw}",
-            'source_title': f"Rising query for '{query.get('seed_keyword', '')}'",
-            'source_metadata': {
-                'seed_keyword': query.get('seed_keyword'),
-                'trend_value': str(value),
-                'is_breakout': is_breakout
-            }
-        })
+    if workers == 1:
+        topics_map = process_serial(reddit_posts, hn_stories, trend_queries)
+    else:
+        topics_map = process_parallel(reddit_posts, hn_stories, trend_queries, workers=workers)
 
     print(f"Extracted {len(topics_map)} unique topics from collected data")
     return topics_map
@@ -145,7 +50,7 @@ def upsert_topics(supabase, topics_map):
 
     upserted_topics = []
 
-    for kw_norm, topic_data in topics_map.items():
+    for kw_norm, topic in topics_map.items():
         try:
             # Check if topic exists
             existing = supabase.table('topics').select('id').eq('keyword_normalised', kw_norm).execute()
@@ -160,43 +65,39 @@ def upsert_topics(supabase, topics_map):
             else:
                 # Insert new topic
                 result = supabase.table('topics').insert({
-                    'keyword': topic_data['keyword'],
+                    'keyword': topic.keyword,
                     'keyword_normalised': kw_norm,
-                    'category': topic_data['category']
+                    'category': topic.category
                 }).execute()
                 topic_id = result.data[0]['id']
 
             # Insert sources (ignore duplicates)
-            for source in topic_data['sources']:
+            for source in topic.sources:
                 try:
-                    supabase.table('topic_sources').insert({
-                        'topic_id': topic_id,
-                        'source': source['source'],
-                        'source_url': source['source_url'],
-                        'source_title': source['source_title'],
-                        'source_metadata': source['source_metadata']
-                    }).execute()
+                    row = source.to_row()
+                    row['topic_id'] = topic_id
+                    supabase.table('topic_sources').insert(row).execute()
                 except Exception:
                     pass  # Duplicate source, ignore
 
-            upserted_topics.append({
-                'id': topic_id,
-                'keyword': topic_data['keyword'],
-                'keyword_normalised': kw_norm,
-                'category': topic_data['category'],
-                'sources': topic_data['sources']
-            })
+            topic.id = topic_id
+            upserted_topics.append(topic)
 
         except Exception as e:
-            print(f"Error upserting topic '{topic_data['keyword']}': {e}")
+            print(f"Error upserting topic '{topic.keyword}': {e}")
             continue
 
     print(f"Upserted {len(upserted_topics)} topics")
     return upserted_topics
 
 
-def calculate_signals(supabase, topics):
-    """Calculate and store signals for each topic"""
+def calculate_signals(supabase, topics, signal_store=None, title_index=None):
+    """Calculate and store signals for each topic
+
+    With a title_index, the Reddit/HN counts, scores and comments all come
+    from every collected post whose title mentions the keyword, not only
+    those it was extracted from (a superset of them).
+    """
     print("\n--- Calculating signals ---")
 
     for topic in topics:
@@ -210,17 +111,23 @@ def calculate_signals(supabase, topics):
             trends_value = 0
             is_breakout = False
 
-            for source in topic['sources']:
-                meta = source.get('source_metadata', {})
-                if source['source'] == 'reddit':
-                    reddit_score += meta.get('score', 0)
-                    reddit_comments += meta.get('num_comments', 0)
+            sources = topic.sources
+            if title_index is not None:
+                # Posts are their own sources; Trends evidence stays the topic's own
+                sources = [post for name, post in title_index.sources_mentioning(topic.keyword)
+                           if name != 'google_trends']
+                sources += [s for s in topic.sources if s.source == 'google_trends']
+
+            for source in sources:
+                if source.source == 'reddit':
+                    reddit_score += source.score
+                    reddit_comments += source.num_comments
                     reddit_posts += 1
-                elif source['source'] == 'hackernews':
-                    hn_score += meta.get('score', 0)
+                elif source.source == 'hackernews':
+                    hn_score += source.score
                     hn_posts += 1
-                elif source['source'] == 'google_trends':
-                    val = meta.get('trend_value', '0')
+                elif source.source == 'google_trends':
+                    val = source.trend_value
                     if val == 'Breakout':
                         is_breakout = True
                         trends_value = max(trends_value, 100)
@@ -236,8 +143,8 @@ def calculate_signals(supabase, topics):
             })
 
             # Store signal
-            supabase.table('topic_signals').insert({
-                'topic_id': topic['id'],
+            signals = {
+                'topic_id': topic.id,
                 'reddit_total_score': reddit_score or None,
                 'reddit_total_comments': reddit_comments or None,
                 'reddit_post_count': reddit_posts or None,
@@ -246,37 +153,50 @@ def calculate_signals(supabase, topics):
                 'google_trends_value': trends_value or None,
                 'google_trends_is_breakout': is_breakout,
                 'momentum_score': momentum
-            }).execute()
-
-            topic['momentum'] = momentum
-            topic['source_count'] = len(set(s['source'] for s in topic['sources']))
+            }
+            supabase.table('topic_signals').insert(signals).execute()
+            topic.signals = signals
+
+            topic.momentum = momentum
+            if signal_store is not None:
+                velocity = signal_store.update(topic.id, momentum)
+                topic.velocity_24h = velocity['velocity_24h']
+                topic.velocity_7d = velocity['velocity_7d']
+                topic.velocity_trend = velocity['velocity_trend']
+                topic.momentum_ewma = velocity['momentum_ewma']
+            topic.source_count = len(topic.source_names())
 
         except Exception as e:
-            print(f"Error calculating signals for '{topic['keyword']}': {e}")
-            topic['momentum'] = 0
-            topic['source_count'] = 0
+            print(f"Error calculating signals for '{topic.keyword}': {e}")
+            topic.momentum = 0
+            topic.source_count = 0
 
     print(f"Calculated signals for {len(topics)} topics")
 
 
-def check_youtube_supply(supabase, topics, limit=50):
+def check_youtube_supply(supabase, topics, limit=50, workers=YOUTUBE_WORKERS, youtube=None):
     """Check YouTube supply for topics"""
-    print(f"\n--- Checking YouTube supply (limit: {limit}) ---")
+    print(f"\n--- Checking YouTube supply (limit: {limit}, workers: {workers}) ---")
 
-    youtube = YouTubeCollector(supabase)
+    youtube = youtube or YouTubeCollector(supabase, max_results=YOUTUBE_SEARCH_RESULTS)
     checked = 0
 
     # Sort by momentum to prioritize high-potential topics
-    sorted_topics = sorted(topics, key=lambda t: t.get('momentum', 0), reverse=True)
+    sorted_topics = sorted(topics, key=lambda t: t.momentum, reverse=True)[:limit]
 
-    for topic in sorted_topics[:limit]:
+    # Searches run concurrently and channel stats are fetched once for the
+    # whole batch; DB writes below stay on this thread
+    supply_results = youtube.check_supply_many([t.keyword for t in sorted_topics], workers=workers)
+    print(f"  Channel lookups: {len(youtube.channel_subs)} channels in {youtube.channel_requests} requests")
+
+    for topic in sorted_topics:
         try:
-            supply_data = youtube.check_supply(topic['keyword'])
+            supply_data = supply_results.get(topic.keyword)
 
             if supply_data:
                 # Store YouTube supply data
                 supabase.table('youtube_supply').insert({
-                    'topic_id': topic['id'],
+                    'topic_id': topic.id,
                     'total_results': supply_data['total_results'],
                     'results_last_7_days': supply_data['results_last_7_days'],
                     'results_last_30_days': supply_data['results_last_30_days'],
@@ -293,15 +213,15 @@ def check_youtube_supply(supabase, topics, limit=50):
                     'top_results': supply_data['top_results']
                 }).execute()
 
-                topic['youtube_data'] = supply_data
+                topic.youtube_data = supply_data
                 checked += 1
-                print(f"  Checked: {topic['keyword']} ({supply_data['total_results']} results)")
+                print(f"  Checked: {topic.keyword} ({supply_data['total_results']} results)")
             else:
-                topic['youtube_data'] = None
+                topic.youtube_data = None
 
         except Exception as e:
-            print(f"Error checking YouTube for '{topic['keyword']}': {e}")
-            topic['youtube_data'] = None
+            print(f"Error checking YouTube for '{topic.keyword}': {e}")
+            topic.youtube_data = None
 
     print(f"Checked YouTube supply for {checked} topics")
     return checked
@@ -316,8 +236,8 @@ def create_opportunities(supabase, topics):
 
     for topic in topics:
         try:
-            momentum = topic.get('momentum', 0)
-            youtube_data = topic.get('youtube_data')
+            momentum = topic.momentum
+            youtube_data = topic.youtube_data
 
             # Calculate supply score
             supply = scorer.calculate_supply_score(youtube_data)
@@ -329,26 +249,37 @@ def create_opportunities(supabase, topics):
             phase = scorer.classify_phase(momentum, supply, gap)
 
             # Determine confidence
-            confidence = scorer.determine_confidence(topic.get('source_count', 1), momentum)
+            confidence = scorer.determine_confidence(topic.source_count, momentum)
+
+            topic.supply_score = supply
+            topic.gap_score = gap
+            topic.phase = phase
+            topic.confidence = confidence
 
             # Get source names
-            sources = list(set(s['source'] for s in topic.get('sources', [])))
+            sources = topic.source_names()
 
             # Upsert opportunity
-            existing = supabase.table('opportunities').select('id').eq('topic_id', topic['id']).execute()
+            existing = supabase.table('opportunities').select('id').eq('topic_id', topic.id).execute()
 
             opportunity_data = {
-                'topic_id': topic['id'],
+                'topic_id': topic.id,
                 'external_momentum': momentum,
                 'youtube_supply': supply,
                 'gap_score': gap,
                 'phase': phase,
                 'confidence': confidence,
-                'keyword': topic['keyword'],
-                'category': topic.get('category', 'uncategorised'),
+                'keyword': topic.keyword,
+                'category': topic.category,
                 'sources': sources,
                 'calculated_at': datetime.now().isoformat()
             }
+            # Only with local history for the window; otherwise keep the
+            # velocity the web app derives from topic_signals
+            for key in ('velocity_24h', 'velocity_7d', 'velocity_trend'):
+                value = getattr(topic, key)
+                if value is not None:
+                    opportunity_data[key] = value
 
             if existing.data:
                 # Update existing opportunity
@@ -360,23 +291,59 @@ def create_opportunities(supabase, topics):
             created += 1
 
             if gap >= 50:
-                print(f"  High opportunity: {topic['keyword']} (gap: {gap}, phase: {phase})")
+                print(f"  High opportunity: {topic.keyword} (gap: {gap}, phase: {phase})")
 
         except Exception as e:
-            print(f"Error creating opportunity for '{topic['keyword']}': {e}")
+            print(f"Error creating opportunity for '{topic.keyword}': {e}")
 
     print(f"Created/updated {created} opportunities")
     return created
 
 
-def run_scan():
-    """Run a complete scan cycle"""
+def export_scan(scan_id, scanned_at, topics):
+    """Write this scan's results to columnar files for offline analysis"""
+    print("\n--- Exporting scan ---")
+
+    try:
+        exporter = ScanExporter(SCAN_EXPORT_DIR, SCAN_EXPORT_FORMAT)
+        written = exporter.export(scan_id, scanned_at, topics)
+        print(f"Exported scan {scan_id}: " + ", ".join(f"{k}={v}" for k, v in written.items()))
+    except Exception as e:
+        print(f"Scan export failed: {e}")
+
+
+PHASES = ('collect', 'process', 'upsert', 'signals', 'youtube', 'score')
+# Phase -> phase whose output it consumes
+PHASE_REQUIRES = {
+    'process': 'collect',
+    'upsert': 'process',
+    'signals': 'upsert',
+    # Both rank and score by momentum, which only 'signals' computes
+    'youtube': 'signals',
+    'score': 'signals',
+}
+
+
+def run_scan(profile=None, phases=PHASES, youtube_limit=50, hn_limit=100,
+             youtube_workers=YOUTUBE_WORKERS, dry_run=False, deadline=SCAN_DEADLINE_SECONDS):
+    """Run a complete scan cycle
+
+    profile: True/False to force the sampling profiler on or off; None samples
+    scans at PROFILE_SAMPLE_RATE.
+    phases: subset of PHASES to run (always in pipeline order).
+    dry_run: read from the database but skip every write, and print
+    throughput per phase.
+    deadline: seconds after which remaining external calls are skipped (0 = none);
+    the scan still scores and records whatever was collected by then.
+    """
     print(f"\n{'='*60}")
-    print(f"Starting scan at {datetime.now().isoformat()}")
+    print(f"Starting {'dry-run ' if dry_run else ''}scan at {datetime.now().isoformat()}")
     print(f"{'='*60}\n")
 
     # Initialize Supabase client
     supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+    if dry_run:
+        supabase = DryRunClient(supabase)
 
     # Create scan log entry
     scan_log = supabase.table('scan_log').insert({
@@ -384,6 +351,7 @@ def run_scan():
         'started_at': datetime.now().isoformat()
     }).execute()
     scan_id = scan_log.data[0]['id']
+    scan_started_at = datetime.now()
 
     stats = {
         'topics_detected': 0,
@@ -392,59 +360,125 @@ def run_scan():
         'opportunities_created': 0
     }
 
+    http = get_http_client()
+    http.reset_stats()
+    http.prune()
+    guard = get_scan_guard()
+    guard.reset(deadline)
+    youtube = YouTubeCollector(supabase, max_results=YOUTUBE_SEARCH_RESULTS) if 'youtube' in phases else None
+
+    def external_calls():
+        """DB calls (dry run only) + HTTP requests that hit the network + YouTube API requests"""
+        calls = supabase.total_calls() if dry_run else 0
+        calls += sum(c['miss'] + c['revalidated'] for c in http.stats.values())
+        return calls + (youtube.api_requests if youtube else 0)
+
+    throughput = PhaseThroughput()
+
+    if profile is None:
+        profile = should_profile(PROFILE_SAMPLE_RATE)
+    profiler = ScanProfiler(interval=PROFILE_INTERVAL_MS / 1000) if profile else None
+    set_phase = profiler.set_phase if profiler else (lambda name: None)
+    if profiler:
+        profiler.start()
+
+    def start_phase(name, title):
+        print(title)
+        set_phase(name)
+        throughput.start(name, external_calls())
+
+    reddit_posts, hn_stories, trend_queries = [], [], []
+    topics_map = {}
+    title_index = None
+    topics = []
+
     try:
         # Phase 1: Run collectors
-        print("=== Phase 1: Data Collection ===")
+        if 'collect' in phases:
+            start_phase('collect', "=== Phase 1: Data Collection ===")
 
-        reddit_posts = []
-        try:
-            reddit = RedditCollector(supabase)
-            reddit_posts = reddit.run()
-        except Exception as e:
-            print(f"Reddit collection failed: {e}")
+            try:
+                reddit = RedditCollector(supabase)
+                reddit_posts = reddit.run()
+            except Exception as e:
+                print(f"Reddit collection failed: {e}")
 
-        hn_stories = []
-        try:
-            hn = HackerNewsCollector(supabase)
-            hn_stories = hn.run()
-        except Exception as e:
-            print(f"HN collection failed: {e}")
+            try:
+                hn = HackerNewsCollector(supabase)
+                hn_stories = hn.run(limit=hn_limit)
+            except Exception as e:
+                print(f"HN collection failed: {e}")
 
-        trend_queries = []
-        try:
-            trends = GoogleTrendsCollector(supabase)
-            trend_queries = trends.run()
-        except Exception as e:
-            print(f"Trends collection failed: {e}")
+            try:
+                trends = GoogleTrendsCollector(supabase)
+                trend_queries = trends.run()
+            except Exception as e:
+                print(f"Trends collection failed: {e}")
+
+            stats['topics_detected'] = len(reddit_posts) + len(hn_stories) + len(trend_queries)
 
-        stats['topics_detected'] = len(reddit_posts) + len(hn_stories) + len(trend_queries)
+            print("HTTP cache:")
+            http.print_stats()
+            throughput.finish(stats['topics_detected'], external_calls())
 
         # Phase 2: Process and deduplicate
-        print("\n=== Phase 2: Processing ===")
-        topics_map = process_collected_data(supabase, reddit_posts, hn_stories, trend_queries)
+        if 'process' in phases:
+            start_phase('process', "\n=== Phase 2: Processing ===")
+            topics_map = process_collected_data(supabase, reddit_posts, hn_stories, trend_queries)
+            title_index = TitleIndex.build(reddit_posts, hn_stories, trend_queries, path=TITLE_INDEX_PATH)
+            print(f"Indexed {len(title_index)} titles ({len(title_index.postings)} tokens)")
+            if not dry_run:
+                try:
+                    title_index.save()
+                except Exception as e:
+                    print(f"Warning: could not save title index: {e}")
+            throughput.finish(stats['topics_detected'], external_calls())
 
         # Phase 3: Upsert topics
-        print("\n=== Phase 3: Database Upsert ===")
-        topics = upsert_topics(supabase, topics_map)
-        stats['topics_updated'] = len(topics)
+        if 'upsert' in phases:
+            start_phase('upsert', "\n=== Phase 3: Database Upsert ===")
+            topics = upsert_topics(supabase, topics_map)
+            stats['topics_updated'] = len(topics)
+            throughput.finish(len(topics), external_calls())
 
         # Phase 4: Calculate signals
-        print("\n=== Phase 4: Signal Calculation ===")
-        calculate_signals(supabase, topics)
+        if 'signals' in phases:
+            start_phase('signals', "\n=== Phase 4: Signal Calculation ===")
+            signal_store = SignalStore.load(SIGNAL_STORE_PATH)
+            calculate_signals(supabase, topics, signal_store, title_index)
+            # A dry run must not leave its momentum samples in the velocity history
+            if not dry_run:
+                try:
+                    signal_store.save()
+                except Exception as e:
+                    print(f"Warning: could not save signal store: {e}")
+            throughput.finish(len(topics), external_calls())
 
         # Phase 5: Check YouTube supply
-        print("\n=== Phase 5: YouTube Supply Check ===")
-        stats['youtube_checks'] = check_youtube_supply(supabase, topics, limit=50)
+        if 'youtube' in phases:
+            start_phase('youtube', "\n=== Phase 5: YouTube Supply Check ===")
+            stats['youtube_checks'] = check_youtube_supply(
+                supabase, topics, limit=youtube_limit, workers=youtube_workers, youtube=youtube)
+            throughput.finish(min(len(topics), youtube_limit), external_calls())
 
         # Phase 6: Create opportunities
-        print("\n=== Phase 6: Opportunity Scoring ===")
-        stats['opportunities_created'] = create_opportunities(supabase, topics)
+        if 'score' in phases:
+            start_phase('score', "\n=== Phase 6: Opportunity Scoring ===")
+            stats['opportunities_created'] = create_opportunities(supabase, topics)
+            throughput.finish(len(topics), external_calls())
+
+        set_phase('finalize')
+        if SCAN_EXPORT_DIR and not dry_run:
+            export_scan(scan_id, scan_started_at, topics)
 
         # Complete scan
         completed_at = datetime.now()
         started_at = datetime.fromisoformat(scan_log.data[0]['started_at'].replace('Z', '+00:00'))
         duration = int((completed_at - started_at.replace(tzinfo=None)).total_seconds())
 
+        # Tripped breakers and a missed deadline mean the results are partial
+        degraded = guard.report()
+
         supabase.table('scan_log').update({
             'status': 'completed',
             'completed_at': completed_at.isoformat(),
@@ -452,6 +486,7 @@ def run_scan():
             'topics_updated': stats['topics_updated'],
             'youtube_checks': stats['youtube_checks'],
             'opportunities_created': stats['opportunities_created'],
+            'errors': degraded,
             'duration_seconds': duration
         }).eq('id', scan_id).execute()
 
@@ -462,8 +497,17 @@ def run_scan():
         print(f"  YouTube checks: {stats['youtube_checks']}")
         print(f"  Opportunities: {stats['opportunities_created']}")
         print(f"  Duration: {duration}s")
+        if degraded:
+            print("  Partial results:")
+            for entry in degraded:
+                print(f"    {entry['message']}")
         print(f"{'='*60}")
 
+        if dry_run:
+            print(f"\nDry run: {supabase.calls['read']} DB reads, "
+                  f"{supabase.calls['skipped_write']} writes skipped")
+            throughput.print_report()
+
     except Exception as e:
         print(f"\nScan failed: {e}")
         import traceback
@@ -472,9 +516,65 @@ def run_scan():
         supabase.table('scan_log').update({
             'status': 'failed',
             'completed_at': datetime.now().isoformat(),
-            'errors': [{'message': str(e)}]
+            'errors': [{'message': str(e)}] + guard.report()
         }).eq('id', scan_id).execute()
 
+    finally:
+        if profiler:
+            profiler.stop()
+            try:
+                collapsed_path, report_path = profiler.write(PROFILE_DIR, scan_id)
+                print(f"Profile written: {collapsed_path} ({profiler.samples} samples), top functions in {report_path}")
+            except Exception as e:
+                print(f"Warning: could not write scan profile: {e}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Run a Niche Radar scan')
+    parser.add_argument('--phases', default=','.join(PHASES),
+                        help=f"comma-separated phases to run (default: all of {','.join(PHASES)})")
+    parser.add_argument('--youtube-limit', type=int, default=50,
+                        help='topics to check on YouTube, highest momentum first (default: 50)')
+    parser.add_argument('--hn-limit', type=int, default=100,
+                        help='HN top stories to fetch (default: 100)')
+    parser.add_argument('--youtube-workers', type=int, default=YOUTUBE_WORKERS,
+                        help=f'concurrent YouTube searches (default: {YOUTUBE_WORKERS})')
+    parser.add_argument('--deadline', type=float, default=SCAN_DEADLINE_SECONDS,
+                        help=f'seconds before remaining external calls are skipped, 0 for none '
+                             f'(default: {SCAN_DEADLINE_SECONDS:g})')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='skip all DB writes and print throughput per phase')
+    profile = parser.add_mutually_exclusive_group()
+    profile.add_argument('--profile', dest='profile', action='store_true', default=None,
+                         help='profile this scan')
+    profile.add_argument('--no-profile', dest='profile', action='store_false',
+                         help='never profile this scan, regardless of PROFILE_SAMPLE_RATE')
+    args = parser.parse_args(argv)
+
+    phases = [p.strip() for p in args.phases.split(',') if p.strip()]
+    unknown = [p for p in phases if p not in PHASES]
+    if unknown:
+        parser.error(f"unknown phase(s): {', '.join(unknown)}")
+    for phase in phases:
+        required = PHASE_REQUIRES.get(phase)
+        if required and required not in phases:
+            parser.error(f"phase '{phase}' needs '{required}'")
+    args.phases = tuple(p for p in PHASES if p in phases)
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    run_scan(
+        profile=args.profile,
+        phases=args.phases,
+        youtube_limit=args.youtube_limit,
+        hn_limit=args.hn_limit,
+        youtube_workers=args.youtube_workers,
+        dry_run=args.dry_run,
+        deadline=args.deadline,
+    )
+
 
 if __name__ == '__main__':
-    run_scan()
+    main()
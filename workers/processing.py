@@ -0,0 +1,210 @@
+"""Turn collected posts into topics, serially or sharded across a process pool.
+
+Keyword extraction is regex-bound and dominates backfills of Reddit/HN dumps.
+`process_parallel` splits the posts into contiguous shards; each worker
+builds a partial topics map for its shard as
+
+    kw_norm -> (keyword, category, [post index, ...])   in first-seen order
+
+and ships it packed as parallel lists plus one array('I') of post indices.
+The parent merges the shards in input order while later shards are still
+being extracted. Posts are their own topic sources (see records.py), so the
+merge only creates the Topic for each new keyword and extends its source list
+with the parent's post objects. Merging contiguous shards in order gives
+exactly the topics, keyword/category choice and source ordering of a serial
+run.
+
+The merge is serial, and its cost grows with the number of distinct keywords,
+not titles. On a worst case where nearly every title contributes a new
+whole-title keyword (400k titles -> 740k topics), extraction took ~5s of
+CPU and the parent merge ~1.6s per 400k titles. The cyclic GC is disabled
+during the merge: it would otherwise rescan the growing map on every
+collection and triple the merge time.
+"""
+import gc
+import multiprocessing
+import os
+import re
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from records import Topic, TrendsSource
+
+MIN_SHARD_SIZE = 2000
+SHARDS_PER_WORKER = 4  # smaller shards even out uneven titles across workers
+
+_shard_items = None  # (reddit_posts, hn_stories), per worker process
+
+
+def extract_keywords(text):
+    """Extract searchable keywords from text (title)"""
+    if not text:
+        return []
+
+    # Remove common prefixes
+    text = re.sub(r'^(TIL|ELI5|CMV|TIFU|AMA|WIBTA|AITA|Show HN|Ask HN|Tell HN|Launch HN)\s*:?\s*', '', text, flags=re.IGNORECASE)
+
+    keywords = []
+
+    # Find quoted terms
+    quoted = re.findall(r'"([^"]+)"', text)
+    keywords.extend(quoted)
+
+    # Find capitalized phrases (2-4 words) - potential product/project names
+    phrases = re.findall(r'\b([A-Z][a-z]+(?:\s+[A-Z][a-z]+){0,3})\b', text)
+    keywords.extend(phrases)
+
+    # Also extract whole title if it's short enough and meaningful
+    clean_title = re.sub(r'[^\w\s]', '', text).strip()
+    if 3 <= len(clean_title.split()) <= 6:
+        keywords.append(clean_title)
+
+    # Normalize and deduplicate
+    normalized = []
+    seen = set()
+    for k in keywords:
+        k = k.lower().strip()
+        if len(k) > 3 and k not in seen and not k.isdigit():
+            seen.add(k)
+            normalized.append(k)
+
+    return normalized[:3]  # Max 3 keywords per item
+
+
+def normalize_keyword(keyword):
+    """Normalize keyword for deduplication"""
+    return re.sub(r'[^\w\s]', '', keyword.lower()).strip()
+
+
+def index_titles(items, start, stop, category=None):
+    """Partial topics map for items[start:stop]; category=None uses each item's own"""
+    partial = {}
+    for i in range(start, stop):
+        item = items[i]
+        for kw in extract_keywords(item.title):
+            kw_norm = normalize_keyword(kw)
+            entry = partial.get(kw_norm)
+            if entry is None:
+                entry = partial[kw_norm] = (kw, category or item.category, [])
+            entry[2].append(i)
+    return partial
+
+
+def merge_partial(topics_map, partial, items):
+    """Fold one shard's partial map into topics_map, keeping first-seen order"""
+    get_item = items.__getitem__
+    for kw_norm, (kw, category, indices) in partial.items():
+        topic = topics_map.get(kw_norm)
+        if topic is None:
+            topic = topics_map[kw_norm] = Topic(kw, kw_norm, category)
+        topic.sources.extend(map(get_item, indices))
+
+
+def pack_partial(partial):
+    """(kw_norms, keywords or None when equal, categories, source counts, post indices)"""
+    keys = list(partial)
+    keywords, categories, counts, indices = [], [], array('I'), array('I')
+    for kw_norm, (kw, category, ids) in partial.items():
+        keywords.append(None if kw == kw_norm else kw)
+        categories.append(category)
+        counts.append(len(ids))
+        indices.extend(ids)
+    return keys, keywords, categories, counts, indices
+
+
+def merge_packed(topics_map, packed, items):
+    """merge_partial for a pack_partial() result"""
+    keys, keywords, categories, counts, indices = packed
+    get_item = items.__getitem__
+    get_topic = topics_map.get
+    ids = iter(indices)
+    for kw_norm, kw, category, n in zip(keys, keywords, categories, counts):
+        topic = get_topic(kw_norm)
+        if topic is None:
+            topic = topics_map[kw_norm] = Topic(kw or kw_norm, kw_norm, category)
+        if n == 1:
+            topic.sources.append(get_item(next(ids)))
+        else:
+            topic.sources.extend(map(get_item, islice(ids, n)))
+
+
+def add_trend_queries(topics_map, trend_queries):
+    for query in trend_queries:
+        kw = query.query
+        kw_norm = normalize_keyword(kw)
+        if not kw_norm:
+            continue
+
+        topic = topics_map.get(kw_norm)
+        if topic is None:
+            topic = topics_map[kw_norm] = Topic(kw, kw_norm, query.category)
+
+        value = query.value
+        is_breakout = value == 'Breakout' if isinstance(value, str) else False
+
+        topic.sources.append(TrendsSource(
+            source_url=f"https://trends.google.com/trends/explore?q={kw}",
+            source_title=f"Rising query for '{query.seed_keyword or ''}'",
+            seed_keyword=query.seed_keyword,
+            trend_value=str(value),
+            is_breakout=is_breakout
+        ))
+
+
+def process_serial(reddit_posts, hn_stories, trend_queries):
+    """keyword_normalised -> Topic, Reddit first, then HN, then Trends"""
+    topics_map = {}
+    merge_partial(topics_map, index_titles(reddit_posts, 0, len(reddit_posts)), reddit_posts)
+    merge_partial(topics_map, index_titles(hn_stories, 0, len(hn_stories), 'tech'), hn_stories)
+    add_trend_queries(topics_map, trend_queries)
+    return topics_map
+
+
+def _init_worker(reddit_posts, hn_stories):
+    # Under fork the posts are inherited, not pickled; spawn pickles them once per worker
+    global _shard_items
+    _shard_items = (reddit_posts, hn_stories)
+    # Shard maps hold no cycles; collections would only rescan the inherited posts
+    gc.disable()
+
+
+def _index_shard(shard):
+    kind, start, stop = shard
+    if kind == 'reddit':
+        return pack_partial(index_titles(_shard_items[0], start, stop))
+    return pack_partial(index_titles(_shard_items[1], start, stop, 'tech'))
+
+
+def _shards(kind, n, shard_size):
+    return [(kind, start, min(start + shard_size, n)) for start in range(0, n, shard_size)]
+
+
+def process_parallel(reddit_posts, hn_stories, trend_queries, workers=None):
+    """Same result as process_serial, with keyword extraction across `workers` processes"""
+    workers = workers or os.cpu_count() or 1
+    total = len(reddit_posts) + len(hn_stories)
+    if workers == 1 or total < MIN_SHARD_SIZE * 2:
+        return process_serial(reddit_posts, hn_stories, trend_queries)
+
+    shard_size = max(MIN_SHARD_SIZE, -(-total // (workers * SHARDS_PER_WORKER)))
+    shards = _shards('reddit', len(reddit_posts), shard_size) + _shards('hn', len(hn_stories), shard_size)
+
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context('fork' if 'fork' in methods else None)
+
+    topics_map = {}
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_init_worker,
+                                 initargs=(reddit_posts, hn_stories)) as executor:
+            # map() yields in submission order, so shards merge in input order as they finish
+            for (kind, _, _), packed in zip(shards, executor.map(_index_shard, shards)):
+                merge_packed(topics_map, packed, reddit_posts if kind == 'reddit' else hn_stories)
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+    add_trend_queries(topics_map, trend_queries)
+    return topics_map
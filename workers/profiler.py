@@ -0,0 +1,118 @@
+"""Low-overhead wall-clock sampling profiler for a scan.
+
+A daemon thread snapshots every other thread's Python stack at a fixed
+interval via sys._current_frames(). Samples are tagged with the scan phase
+that was active when they were taken and folded into collapsed stacks, so
+blocking waits (sockets, sleeps) show up alongside CPU time. The output is
+compatible with flamegraph.pl and speedscope:
+
+    <dir>/scan-<scan_id>.collapsed   phase;frame;frame;... <count>
+    <dir>/scan-<scan_id>.top.txt     top-N hot functions per phase
+"""
+import os
+import random
+import sys
+import threading
+from collections import Counter, defaultdict
+
+TRUNCATED = '[truncated]'  # stands in for the middle frames of a stack deeper than max_depth
+
+
+class ScanProfiler:
+    def __init__(self, interval=0.01, max_depth=64):
+        self.interval = interval
+        self.max_depth = max_depth
+        self.phase = 'setup'
+        self.stacks = Counter()  # (phase, frame, ...) root first -> samples
+        self.samples = 0
+        self._labels = {}  # code object -> label
+        self._stop = threading.Event()
+        self._thread = None
+
+    def set_phase(self, phase):
+        self.phase = phase
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='scan-profiler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+    def _label(self, code):
+        label = self._labels.get(code)
+        if label is None:
+            label = f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+            self._labels[code] = label
+        return label
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            phase = self.phase
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                codes = []
+                while frame is not None:
+                    codes.append(frame.f_code)
+                    frame = frame.f_back
+                codes.reverse()
+                # Deep stacks keep both ends: the root frames so they still merge
+                # with shallower siblings, and the leaf frames that own the time
+                if len(codes) > self.max_depth:
+                    head = self.max_depth // 2
+                    tail = self.max_depth - head
+                    codes = codes[:head] + [None] + codes[-tail:]
+                stack = [phase]
+                stack.extend(TRUNCATED if code is None else self._label(code) for code in codes)
+                self.stacks[tuple(stack)] += 1
+            self.samples += 1
+
+    def top_functions(self, n=15):
+        """{phase: ([(label, self samples)], [(label, inclusive samples)])}"""
+        own = defaultdict(Counter)
+        inclusive = defaultdict(Counter)
+        for stack, count in self.stacks.items():
+            phase, frames = stack[0], stack[1:]
+            if frames:
+                own[phase][frames[-1]] += count
+            for label in set(frames):
+                if label != TRUNCATED:
+                    inclusive[phase][label] += count
+        return {phase: (own[phase].most_common(n), inclusive[phase].most_common(n)) for phase in own}
+
+    def write(self, directory, scan_id, top_n=15):
+        """Write collapsed stacks and the per-phase top-N report; returns both paths"""
+        os.makedirs(directory, exist_ok=True)
+        collapsed_path = os.path.join(directory, f"scan-{scan_id}.collapsed")
+        report_path = os.path.join(directory, f"scan-{scan_id}.top.txt")
+
+        with open(collapsed_path, 'w') as f:
+            for stack, count in sorted(self.stacks.items()):
+                f.write(f"{';'.join(label.replace(';', ':') for label in stack)} {count}\n")
+
+        phase_totals = Counter()
+        for stack, count in self.stacks.items():
+            phase_totals[stack[0]] += count
+
+        with open(report_path, 'w') as f:
+            f.write(f"scan {scan_id}: {self.samples} samples every {self.interval * 1000:.0f}ms\n")
+            for phase, (own, inclusive) in self.top_functions(top_n).items():
+                total = phase_totals[phase] or 1
+                f.write(f"\n== {phase} ({phase_totals[phase]} thread samples) ==\n")
+                f.write("  self:\n")
+                for label, count in own:
+                    f.write(f"    {count / total:6.1%}  {label}\n")
+                f.write("  inclusive:\n")
+                for label, count in inclusive:
+                    f.write(f"    {count / total:6.1%}  {label}\n")
+
+        return collapsed_path, report_path
+
+
+def should_profile(sample_rate):
+    """Decide whether this scan is profiled; sample_rate is 0..1 (e.g. 0.1 = one scan in ten)"""
+    return sample_rate > 0 and random.random() < sample_rate
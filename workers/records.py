@@ -0,0 +1,173 @@
+"""Slotted record types passed between scan phases.
+
+Collected posts, topic sources and YouTube video stats are created in the
+hundreds of thousands during backfills, so each type uses __slots__ instead of
+a per-instance dict. A Reddit post or HN story is itself the source attached to
+every topic extracted from its title: topics hold references to the collected
+posts rather than per-keyword copies, and the JSON metadata is only built when
+a row is written to the database.
+"""
+
+
+class Source:
+    """Base for a single piece of evidence attached to a topic
+
+    Subclasses provide source_url and source_title.
+    """
+    __slots__ = ()
+    source = None
+
+    def metadata(self):
+        return {}
+
+    def to_row(self):
+        """Columns for a topic_sources insert"""
+        return {
+            'source': self.source,
+            'source_url': self.source_url,
+            'source_title': self.source_title,
+            'source_metadata': self.metadata()
+        }
+
+
+class RedditPost(Source):
+    __slots__ = ('title', 'score', 'upvote_ratio', 'num_comments', 'created_utc',
+                 'subreddit', 'url', 'author', 'category')
+    source = 'reddit'
+
+    def __init__(self, title, score, upvote_ratio, num_comments, created_utc,
+                 subreddit, url, author='', category='uncategorised'):
+        self.title = title
+        self.score = score
+        self.upvote_ratio = upvote_ratio
+        self.num_comments = num_comments
+        self.created_utc = created_utc  # unix seconds
+        self.subreddit = subreddit
+        self.url = url
+        self.author = author
+        self.category = category
+
+    @property
+    def source_url(self):
+        return self.url
+
+    @property
+    def source_title(self):
+        return self.title
+
+    def metadata(self):
+        return {
+            'subreddit': self.subreddit,
+            'score': self.score,
+            'num_comments': self.num_comments
+        }
+
+
+class HNStory(Source):
+    __slots__ = ('title', 'score', 'url', 'hn_url', 'num_comments', 'created_utc')
+    source = 'hackernews'
+
+    def __init__(self, title, score, url, hn_url, num_comments, created_utc):
+        self.title = title
+        self.score = score
+        self.url = url
+        self.hn_url = hn_url
+        self.num_comments = num_comments
+        self.created_utc = created_utc  # unix seconds
+
+    @property
+    def source_url(self):
+        return self.hn_url
+
+    @property
+    def source_title(self):
+        return self.title
+
+    def metadata(self):
+        return {
+            'score': self.score,
+            'num_comments': self.num_comments
+        }
+
+
+class TrendQuery:
+    __slots__ = ('query', 'value', 'seed_keyword', 'category')
+
+    def __init__(self, query, value, seed_keyword=None, category='uncategorised'):
+        self.query = query
+        self.value = value  # int, or 'Breakout'
+        self.seed_keyword = seed_keyword
+        self.category = category
+
+
+class TrendsSource(Source):
+    __slots__ = ('source_url', 'source_title', 'seed_keyword', 'trend_value', 'is_breakout')
+    source = 'google_trends'
+
+    def __init__(self, source_url, source_title, seed_keyword, trend_value, is_breakout=False):
+        self.source_url = source_url
+        self.source_title = source_title
+        self.seed_keyword = seed_keyword
+        self.trend_value = trend_value  # str, as stored in source_metadata
+        self.is_breakout = is_breakout
+
+    def metadata(self):
+        return {
+            'seed_keyword': self.seed_keyword,
+            'trend_value': self.trend_value,
+            'is_breakout': self.is_breakout
+        }
+
+
+class Topic:
+    """A normalised keyword, its sources and the scores computed for it"""
+    __slots__ = ('id', 'keyword', 'keyword_normalised', 'category', 'sources',
+                 'signals', 'momentum', 'source_count', 'velocity_24h', 'velocity_7d',
+                 'velocity_trend', 'momentum_ewma', 'youtube_data', 'supply_score',
+                 'gap_score', 'phase', 'confidence')
+
+    def __init__(self, keyword, keyword_normalised, category='uncategorised'):
+        self.id = None
+        self.keyword = keyword
+        self.keyword_normalised = keyword_normalised
+        self.category = category
+        self.sources = []
+        self.signals = None  # topic_signals row for this scan
+        self.momentum = 0
+        self.source_count = 0
+        self.velocity_24h = None
+        self.velocity_7d = None
+        self.velocity_trend = None
+        self.momentum_ewma = None
+        self.youtube_data = None
+        self.supply_score = None
+        self.gap_score = None
+        self.phase = None
+        self.confidence = None
+
+    def source_names(self):
+        return list(set(s.source for s in self.sources))
+
+
+class VideoStat:
+    __slots__ = ('video_id', 'title', 'channel_id', 'views', 'subs', 'age_days', 'vps_ratio')
+
+    def __init__(self, video_id, title, channel_id, views, subs, age_days, vps_ratio):
+        self.video_id = video_id
+        self.title = title
+        self.channel_id = channel_id
+        self.views = views
+        self.subs = subs
+        self.age_days = age_days
+        self.vps_ratio = vps_ratio
+
+    def to_dict(self):
+        return {
+            'video_id': self.video_id,
+            'title': self.title,
+            'channel_id': self.channel_id,
+            'views': self.views,
+            'subs': self.subs,
+            'age_days': self.age_days,
+            'vps_ratio': self.vps_ratio
+        }
@@ -0,0 +1,203 @@
+import math
+import os
+import pickle
+import time
+from array import array
+
+STORE_VERSION = 1
+
+# One slot per hour. The 7d lookup searches up to 42h (25% tolerance) past
+# the target, so 216 slots (9 days) never alias a slot we still need.
+WINDOW_SLOTS = 216
+WINDOW_24H = (24, 6)
+WINDOW_7D = (24 * 7, 42)
+
+MAX_VELOCITY = 999.99  # opportunities.velocity_* is DECIMAL(5,2)
+
+
+class SignalStore:
+    """Compact local time-series of momentum per topic.
+
+    Each topic owns a fixed-size ring of hourly slots inside two flat
+    array-backed columns (hour stamp + momentum), so recording a scan is O(1)
+    and rolling lookups only touch a bounded number of slots regardless of
+    how long a topic has been tracked. Topics not seen for a whole window
+    can never be looked up again; save() compacts them away.
+    """
+
+    def __init__(self, path=None, slots=WINDOW_SLOTS, ewma_halflife_hours=24):
+        self.path = path
+        self.slots = slots
+        self.ewma_halflife_hours = ewma_halflife_hours
+        self.rows = {}  # topic_id -> row index
+        self.hours = array('I')  # hour since epoch per slot, 0 = empty
+        self.values = array('f')  # momentum per slot
+        self.ewma = array('d')  # per row
+        self.ewma_ts = array('d')  # per row, unix seconds of last EWMA update
+
+    @classmethod
+    def load(cls, path, **kwargs):
+        """Load a store from disk, or start an empty one"""
+        store = cls(path, **kwargs)
+        if not path or not os.path.exists(path):
+            return store
+
+        try:
+            with open(path, 'rb') as f:
+                state = pickle.load(f)
+        except Exception as e:
+            print(f"Warning: could not read signal store at {path}: {e}")
+            return store
+
+        if state.get('version') != STORE_VERSION or state.get('slots') != store.slots:
+            print("Warning: signal store layout changed, starting fresh")
+            return store
+
+        store.rows = state['rows']
+        store.hours = state['hours']
+        store.values = state['values']
+        store.ewma = state['ewma']
+        store.ewma_ts = state['ewma_ts']
+        return store
+
+    def prune(self, now=None):
+        """Drop rows whose newest sample is older than the window; returns rows removed
+
+        Surviving rows are re-packed in their existing order into fresh columns.
+        """
+        now = time.time() if now is None else now
+        cutoff = int(now // 3600) - self.slots
+        keep = [(topic_id, row) for topic_id, row in self.rows.items()
+                if int(self.ewma_ts[row] // 3600) >= cutoff]
+        removed = len(self.rows) - len(keep)
+        if not removed:
+            return 0
+
+        hours, values = array('I'), array('f')
+        ewma, ewma_ts = array('d'), array('d')
+        rows = {}
+        slots = self.slots
+        for new_row, (topic_id, row) in enumerate(keep):
+            rows[topic_id] = new_row
+            base = row * slots
+            hours.extend(self.hours[base:base + slots])
+            values.extend(self.values[base:base + slots])
+            ewma.append(self.ewma[row])
+            ewma_ts.append(self.ewma_ts[row])
+
+        self.rows, self.hours, self.values = rows, hours, values
+        self.ewma, self.ewma_ts = ewma, ewma_ts
+        return removed
+
+    def save(self, now=None):
+        """Compact out expired topics and atomically write the store to disk"""
+        if not self.path:
+            return
+
+        self.prune(now)
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump({
+                'version': STORE_VERSION,
+                'slots': self.slots,
+                'rows': self.rows,
+                'hours': self.hours,
+                'values': self.values,
+                'ewma': self.ewma,
+                'ewma_ts': self.ewma_ts,
+            }, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self.path)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def _row(self, topic_id):
+        row = self.rows.get(topic_id)
+        if row is None:
+            row = len(self.rows)
+            self.rows[topic_id] = row
+            self.hours.frombytes(bytes(self.hours.itemsize * self.slots))
+            self.values.frombytes(bytes(self.values.itemsize * self.slots))
+            self.ewma.append(0.0)
+            self.ewma_ts.append(0.0)
+        return row
+
+    def record(self, topic_id, momentum, ts=None):
+        """Record a momentum sample for a topic (latest sample per hour wins)"""
+        ts = time.time() if ts is None else ts
+        hour = int(ts // 3600)
+        row = self._row(topic_id)
+
+        i = row * self.slots + hour % self.slots
+        self.hours[i] = hour
+        self.values[i] = momentum
+
+        last_ts = self.ewma_ts[row]
+        if not last_ts:
+            self.ewma[row] = momentum
+        elif ts > last_ts:
+            elapsed_hours = (ts - last_ts) / 3600
+            alpha = 1 - math.pow(0.5, elapsed_hours / self.ewma_halflife_hours)
+            self.ewma[row] += alpha * (momentum - self.ewma[row])
+        self.ewma_ts[row] = max(ts, last_ts)
+
+    def value_at(self, topic_id, hours_ago, tolerance_hours, now=None):
+        """Momentum closest to `hours_ago` within tolerance, or None"""
+        row = self.rows.get(topic_id)
+        if row is None:
+            return None
+
+        now = time.time() if now is None else now
+        target = int(now // 3600) - hours_ago
+        base = row * self.slots
+
+        for offset in range(tolerance_hours + 1):
+            for hour in (target - offset, target + offset):
+                i = base + hour % self.slots
+                if self.hours[i] == hour:
+                    return self.values[i]
+        return None
+
+    def velocity(self, topic_id, current_momentum, now=None):
+        """Rolling 24h/7d momentum change (%), trend and EWMA for a topic"""
+        velocity_24h = self._pct_change(
+            current_momentum, self.value_at(topic_id, *WINDOW_24H, now=now))
+        velocity_7d = self._pct_change(
+            current_momentum, self.value_at(topic_id, *WINDOW_7D, now=now))
+
+        row = self.rows.get(topic_id)
+        return {
+            'velocity_24h': velocity_24h,
+            'velocity_7d': velocity_7d,
+            'velocity_trend': determine_trend(velocity_7d),
+            'momentum_ewma': round(self.ewma[row], 2) if row is not None else None,
+        }
+
+    def update(self, topic_id, momentum, ts=None):
+        """Record the current momentum and return its rolling velocity"""
+        ts = time.time() if ts is None else ts
+        self.record(topic_id, momentum, ts)
+        return self.velocity(topic_id, momentum, now=ts)
+
+    @staticmethod
+    def _pct_change(current, previous):
+        if previous is None or previous <= 0:
+            return None
+        change = (current - previous) / previous * 100
+        return round(max(-MAX_VELOCITY, min(change, MAX_VELOCITY)), 2)
+
+
+def determine_trend(velocity_7d):
+    """Classify the 7d velocity as accelerating, stable or declining"""
+    if velocity_7d is None:
+        return None
+    if velocity_7d > 30:
+        return 'accelerating'
+    if velocity_7d < -15:
+        return 'declining'
+    return 'stable'
@@ -0,0 +1,180 @@
+"""Inverted index from lowercased title token to collected post ids.
+
+Built during Phase 2 over every Reddit post, HN story and Trends query of the
+scan. Post ids are positions in `posts`; each posting list is an array('I')
+in ascending id order, so a multi-word lookup walks the shortest list and
+bisects the others instead of scanning every title. Phrases are confirmed
+only on the surviving candidates.
+
+    index.mentions('local llama')          -> [post id, ...]
+    index.mention_counts('local llama')    -> Counter({'reddit': 12, 'hackernews': 3})
+    index.cooccurring('local llama', 10)   -> [(token, posts), ...]
+    index.co_occurrence('rust', 'kernel')  -> posts mentioning both
+"""
+import os
+import pickle
+import re
+from array import array
+from bisect import bisect_left
+from collections import Counter
+
+from processing import normalize_keyword
+
+INDEX_VERSION = 1
+SOURCE_NAMES = ('reddit', 'hackernews', 'google_trends')
+MIN_TOKEN_LENGTH = 4  # same cut-off as extract_keywords, for co-occurrence results
+WORD_RE = re.compile(r'\w+')
+
+
+def tokenize(text):
+    """Query tokens: the words of normalize_keyword(text)"""
+    return normalize_keyword(text or '').split()
+
+
+def title_forms(text):
+    """A title as normalize_keyword sees it ("don't" -> "dont") and split at
+    punctuation ("Llama-3" -> "llama 3"); extract_keywords can produce either"""
+    text = (text or '').lower()
+    return normalize_keyword(text).split(), WORD_RE.findall(text)
+
+
+def _contains(postings, post_id):
+    i = bisect_left(postings, post_id)
+    return i < len(postings) and postings[i] == post_id
+
+
+class TitleIndex:
+    def __init__(self, path=None):
+        self.path = path
+        self.postings = {}  # token -> array('I') of post ids
+        self.posts = []  # post id -> RedditPost / HNStory / TrendQuery
+        self.sources = array('B')  # post id -> index into SOURCE_NAMES
+        self._padded = {}  # post id -> both title forms, space-padded, for phrase checks
+
+    @classmethod
+    def build(cls, reddit_posts, hn_stories, trend_queries, path=None):
+        index = cls(path)
+        index.add_posts(reddit_posts, 'reddit')
+        index.add_posts(hn_stories, 'hackernews')
+        index.add_posts(trend_queries, 'google_trends', text=lambda query: query.query)
+        return index
+
+    def add_posts(self, posts, source, text=lambda post: post.title):
+        code = SOURCE_NAMES.index(source)
+        postings = self.postings
+        for post in posts:
+            post_id = len(self.posts)
+            self.posts.append(post)
+            self.sources.append(code)
+            joined, split = title_forms(text(post))
+            for token in set(joined).union(split):
+                ids = postings.get(token)
+                if ids is None:
+                    ids = postings[token] = array('I')
+                ids.append(post_id)
+
+    def _text(self, post_id):
+        if SOURCE_NAMES[self.sources[post_id]] == 'google_trends':
+            return self.posts[post_id].query
+        return self.posts[post_id].title
+
+    def mentions(self, keyword):
+        """Ids of posts whose title contains the keyword as a whole-word phrase"""
+        tokens = tokenize(keyword)
+        if not tokens:
+            return []
+
+        lists = []
+        for token in set(tokens):
+            ids = self.postings.get(token)
+            if ids is None:
+                return []
+            lists.append(ids)
+        lists.sort(key=len)
+
+        shortest, others = lists[0], lists[1:]
+        candidates = [i for i in shortest if all(_contains(ids, i) for ids in others)]
+        if len(tokens) == 1:
+            return candidates
+
+        phrase = f" {' '.join(tokens)} "
+        return [i for i in candidates if phrase in self._padded_text(i)]
+
+    def _padded_text(self, post_id):
+        text = self._padded.get(post_id)
+        if text is None:
+            joined, split = title_forms(self._text(post_id))
+            text = self._padded[post_id] = f" {' '.join(joined)} | {' '.join(split)} "
+        return text
+
+    def mention_counts(self, keyword):
+        """Counter of source name -> posts mentioning the keyword"""
+        sources = self.sources
+        counts = Counter(sources[i] for i in self.mentions(keyword))
+        return Counter({SOURCE_NAMES[code]: n for code, n in counts.items()})
+
+    def sources_mentioning(self, keyword):
+        """[(source name, post), ...] for every post mentioning the keyword, in id order"""
+        return [(SOURCE_NAMES[self.sources[i]], self.posts[i]) for i in self.mentions(keyword)]
+
+    def cooccurring(self, keyword, n=10):
+        """Tokens appearing most often in titles that mention the keyword"""
+        own = set(tokenize(keyword))
+        counts = Counter()
+        for post_id in self.mentions(keyword):
+            counts.update(t for t in set(tokenize(self._text(post_id)))
+                          if t not in own and len(t) >= MIN_TOKEN_LENGTH)
+        return counts.most_common(n)
+
+    def co_occurrence(self, keyword_a, keyword_b):
+        """Number of posts mentioning both keywords"""
+        a = self.mentions(keyword_a)
+        if not a:
+            return 0
+        b = set(self.mentions(keyword_b))
+        return sum(1 for i in a if i in b)
+
+    def __len__(self):
+        return len(self.posts)
+
+    @classmethod
+    def load(cls, path):
+        """Load a saved index, or None if it is missing or unreadable"""
+        if not path or not os.path.exists(path):
+            return None
+
+        try:
+            with open(path, 'rb') as f:
+                state = pickle.load(f)
+        except Exception as e:
+            print(f"Warning: could not read title index at {path}: {e}")
+            return None
+
+        if state.get('version') != INDEX_VERSION:
+            print("Warning: title index layout changed, ignoring saved index")
+            return None
+
+        index = cls(path)
+        index.postings = state['postings']
+        index.posts = state['posts']
+        index.sources = state['sources']
+        return index
+
+    def save(self):
+        """Atomically write the index to disk"""
+        if not self.path:
+            return
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump({
+                'version': INDEX_VERSION,
+                'postings': self.postings,
+                'posts': self.posts,
+                'sources': self.sources,
+            }, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self.path)